@@ -0,0 +1,184 @@
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from instancia import Instancia, Solucao
+from resolver import resolver
+
+
+class AlocadorOnline:
+    # Modo contínuo: mantém X e as cargas vivos enquanto os pedidos chegam ou
+    # são cancelados. Cada chegada vai para o container de menor folga que a
+    # comporta (primeiro os abaixo do mínimo), cada cancelamento tenta repor
+    # a carga com um pedido não atendido, e só quando a deriva acumulada
+    # (operações que deixaram pedido de fora ou container violado) passa de
+    # limite_deriva a instância inteira é resolvida de novo com o resolver.
+    def __init__(self, instancia, solucao=None, limite_deriva=1000,
+                 tempo_reotimizacao=1.0, **opcoes_resolver):
+        self.instancia = Instancia(instancia.quantidades, instancia.lucros,
+                                   instancia.limites_inferiores, instancia.limites_superiores)
+        X = solucao.X if solucao is not None else None
+        self.solucao = Solucao(self.instancia, X)
+        self.ativo = bytearray(b'\x01') * self.instancia.n
+        self.limite_deriva = limite_deriva
+        self.tempo_reotimizacao = tempo_reotimizacao
+        self.opcoes_resolver = opcoes_resolver
+        self.deriva = 0
+        self._montar_indices()
+
+    def _montar_indices(self):
+        inst, sol = self.instancia, self.solucao
+        self._abaixo_minimo = _ListaOrdenada()
+        self._demais = _ListaOrdenada()
+        self._chave = [None] * inst.k
+        for v in range(inst.k):
+            self._indexar_container(v)
+        self._nao_atendidos = _ListaOrdenada()
+        for i, v in enumerate(sol.X):
+            if v == -1 and self.ativo[i]:
+                self._nao_atendidos.adicionar((inst.quantidades[i], i))
+
+    def _indexar_container(self, v):
+        inst, sol = self.instancia, self.solucao
+        if self._chave[v] is not None:
+            lista, chave = self._chave[v]
+            lista.remover(chave)
+        lista = self._abaixo_minimo if sol.cargas[v] < inst.limites_inferiores[v] else self._demais
+        chave = (inst.limites_superiores[v] - sol.cargas[v], v)
+        lista.adicionar(chave)
+        self._chave[v] = (lista, chave)
+
+    def _melhor_container(self, q):
+        cargas, lim_sup = self.solucao.cargas, self.instancia.limites_superiores
+        for lista in (self._abaixo_minimo, self._demais):
+            for _, v in lista.a_partir_de((q, -1)):
+                # A folga só ordena; o critério é o "carga + q <= máximo" de
+                # sempre, que pode diferir no último bit.
+                if cargas[v] + q <= lim_sup[v]:
+                    return v
+        return -1
+
+    def _atribuir(self, i, v):
+        inst, sol = self.instancia, self.solucao
+        origem = sol.X[i]
+        if origem != -1:
+            sol.cargas[origem] -= inst.quantidades[i]
+            self._indexar_container(origem)
+        sol.X[i] = v
+        if v != -1:
+            sol.cargas[v] += inst.quantidades[i]
+            self._indexar_container(v)
+
+    def _valido(self, v):
+        inst = self.instancia
+        return inst.limites_inferiores[v] <= self.solucao.cargas[v] <= inst.limites_superiores[v]
+
+    def inserir(self, quantidade, lucro=None):
+        # Registra um pedido novo e devolve o seu índice.
+        inst, sol = self.instancia, self.solucao
+        i = inst.n
+        inst.quantidades.append(quantidade)
+        inst.lucros.append(quantidade if lucro is None else lucro)
+        sol.X.append(-1)
+        self.ativo.append(1)
+        v = self._melhor_container(quantidade)
+        if v == -1:
+            self._nao_atendidos.adicionar((quantidade, i))
+            self._registrar_deriva()
+        else:
+            self._atribuir(i, v)
+        return i
+
+    def cancelar(self, i):
+        inst, sol = self.instancia, self.solucao
+        if not self.ativo[i]:
+            raise ValueError(f"pedido {i} já foi cancelado")
+        self.ativo[i] = 0
+        v = sol.X[i]
+        if v == -1:
+            self._nao_atendidos.remover((inst.quantidades[i], i))
+            return
+        estava_valido = self._valido(v)
+        self._atribuir(i, -1)
+        if estava_valido and not self._valido(v):
+            self._reparar(v)
+
+    def _reparar(self, v):
+        # Reparo limitado: um único pedido não atendido que leve a carga de
+        # volta para [mínimo, máximo].
+        inst, sol = self.instancia, self.solucao
+        falta = inst.limites_inferiores[v] - sol.cargas[v]
+        sobra = inst.limites_superiores[v] - sol.cargas[v]
+        for q, j in self._nao_atendidos.a_partir_de((falta, -1)):
+            if q > sobra:
+                break
+            if inst.limites_inferiores[v] <= sol.cargas[v] + q <= inst.limites_superiores[v]:
+                self._nao_atendidos.remover((q, j))
+                self._atribuir(j, v)
+                return
+        self._registrar_deriva()
+
+    def _registrar_deriva(self):
+        self.deriva += 1
+        if self.deriva > self.limite_deriva:
+            self.reotimizar()
+
+    def reotimizar(self):
+        # Resolve de novo só os pedidos ativos e fica com o resultado se ele
+        # não for pior (violações, depois lucro) que a solução atual.
+        inst, sol = self.instancia, self.solucao
+        ativos = np.flatnonzero(np.frombuffer(self.ativo, dtype=np.uint8))
+        sub = Instancia(inst.como_numpy('quantidades')[ativos], inst.como_numpy('lucros')[ativos],
+                        inst.limites_inferiores, inst.limites_superiores)
+        nova = resolver(sub, self.tempo_reotimizacao, **self.opcoes_resolver)
+        self.deriva = 0
+        if (nova.violacoes(), -nova.lucro()) > (sol.violacoes(), -sol.lucro()):
+            return
+        X = np.frombuffer(sol.X, dtype=np.int64)
+        X[ativos] = np.frombuffer(nova.X, dtype=np.int64)
+        del X
+        sol.recalcular_cargas()
+        self._montar_indices()
+
+
+class _ListaOrdenada:
+    # Lista ordenada em blocos (cada um com até 2 * CARGA itens): inserção e
+    # remoção custam O(log n + CARGA) em vez de mover a lista inteira.
+    CARGA = 512
+
+    def __init__(self):
+        self._blocos = []
+        self._maximos = []
+
+    def adicionar(self, item):
+        if not self._blocos:
+            self._blocos.append([item])
+            self._maximos.append(item)
+            return
+        b = min(bisect_left(self._maximos, item), len(self._blocos) - 1)
+        bloco = self._blocos[b]
+        insort(bloco, item)
+        self._maximos[b] = bloco[-1]
+        if len(bloco) > 2 * self.CARGA:
+            self._blocos[b:b + 1] = [bloco[:self.CARGA], bloco[self.CARGA:]]
+            self._maximos[b:b + 1] = [bloco[self.CARGA - 1], bloco[-1]]
+
+    def remover(self, item):
+        b = bisect_left(self._maximos, item)
+        bloco = self._blocos[b]
+        del bloco[bisect_left(bloco, item)]
+        if bloco:
+            self._maximos[b] = bloco[-1]
+        else:
+            del self._blocos[b]
+            del self._maximos[b]
+
+    def a_partir_de(self, item):
+        # Itens >= item, em ordem crescente.
+        b = bisect_left(self._maximos, item)
+        if b == len(self._blocos):
+            return
+        bloco = self._blocos[b]
+        yield from bloco[bisect_left(bloco, item):]
+        for bloco in self._blocos[b + 1:]:
+            yield from bloco
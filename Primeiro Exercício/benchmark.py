@@ -0,0 +1,128 @@
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from busca_local import busca_local
+from busca_tabu import busca_tabu
+from gerador import APERTOS, DISTRIBUICOES, gerar_instancia
+from instancia import Instancia
+from melhoria import recozimento_simulado
+from rastro import Rastro
+from resolver import construir
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+MODOS_CONSTRUCAO = ('first_fit', 'best_fit')
+MODOS_BUSCA = ('primeira_melhora', 'prioridade', 'tabu')
+
+
+def medir(instancia, modo_construcao, modo_busca, tempo_limite, semente=0, fase_lucro=True):
+    # Roda as fases do resolver uma a uma, cronometrando cada uma. A
+    # viabilidade é o instante em que a busca zera as violações (None se não
+    # zerou dentro do tempo).
+    prazo = time.time() + tempo_limite
+    inicio = time.perf_counter()
+    solucao = construir(instancia, modo_construcao)
+    tempo_construcao = time.perf_counter() - inicio
+    violacoes_iniciais = solucao.violacoes()
+
+    rastro = None
+    if modo_busca == 'tabu':
+        busca_tabu(instancia, solucao, max(prazo - time.time(), 0), semente=semente)
+    else:
+        estrategia = 'prioridade' if modo_busca == 'prioridade' else 'aleatoria'
+        rastro = busca_local(instancia, solucao, max(prazo - time.time(), 0), semente=semente,
+                             estrategia=estrategia, rastro=Rastro())
+    tempo_busca = time.perf_counter() - inicio
+    violacoes = solucao.violacoes()
+    lucro_busca = solucao.lucro()
+
+    if fase_lucro:
+        recozimento_simulado(instancia, solucao, max(prazo - time.time(), 0), semente=semente)
+
+    return {
+        'tempo_construcao': tempo_construcao,
+        'violacoes_iniciais': violacoes_iniciais,
+        'tempo_viabilidade': tempo_busca if violacoes == 0 else None,
+        'violacoes': violacoes,
+        'lucro_busca': lucro_busca,
+        'lucro_final': solucao.lucro(),
+        'pedidos_atendidos': solucao.atendidos(),
+        'movimentos_por_segundo': rastro.iteracoes_por_segundo if rastro is not None else None,
+        'tempo_total': time.perf_counter() - inicio,
+    }
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=DIRETORIO,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mede construção, viabilidade, lucro e movimentos por segundo de cada "
+                    "modo em instâncias geradas, acrescentando um registro JSON por rodada.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="quantidades de pedidos")
+    parser.add_argument('--containers', type=int, default=None,
+                        help="padrão: um container para cada 20 pedidos")
+    parser.add_argument('--apertos', nargs='+', choices=sorted(APERTOS), default=['medio'])
+    parser.add_argument('--distribuicoes', nargs='+', choices=DISTRIBUICOES, default=['uniforme'])
+    parser.add_argument('--formato', choices=['lucro', 'quantidades'], default='lucro')
+    parser.add_argument('--modos-construcao', nargs='+', choices=MODOS_CONSTRUCAO,
+                        default=list(MODOS_CONSTRUCAO))
+    parser.add_argument('--modos-busca', nargs='+', choices=MODOS_BUSCA, default=list(MODOS_BUSCA))
+    parser.add_argument('--tempo-limite', type=float, default=10.0,
+                        help="tempo limite por rodada, em segundos")
+    parser.add_argument('--sem-fase-lucro', action='store_true')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', default='benchmark.jsonl',
+                        help="arquivo JSONL onde os registros são acrescentados")
+    args = parser.parse_args(argv)
+
+    comum = {
+        'commit': _commit_atual(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'formato': args.formato,
+        'tempo_limite': args.tempo_limite,
+        'semente': args.semente,
+    }
+    with open(args.saida, 'a', encoding='utf-8') as saida:
+        for n, aperto, distribuicao in itertools.product(args.tamanhos, args.apertos,
+                                                        args.distribuicoes):
+            pedidos, container = gerar_instancia(n, args.containers, args.semente,
+                                                 aperto, distribuicao)
+            if args.formato == 'quantidades':
+                # Mesma leitura do binpacksimplificado: só as quantidades e
+                # containers [0, 1].
+                pedidos, container = pedidos[:, :1], [[0.0, 1.0]] * len(container)
+            instancia = Instancia.de_arrays(pedidos, container)
+            del pedidos, container
+            for modo_construcao, modo_busca in itertools.product(args.modos_construcao,
+                                                                 args.modos_busca):
+                with contextlib.redirect_stdout(sys.stderr):
+                    medidas = medir(instancia, modo_construcao, modo_busca, args.tempo_limite,
+                                    args.semente, not args.sem_fase_lucro)
+                registro = {**comum, 'pedidos': instancia.n, 'containers': instancia.k,
+                            'aperto': aperto, 'distribuicao': distribuicao,
+                            'modo_construcao': modo_construcao, 'modo_busca': modo_busca,
+                            **medidas}
+                saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+                saida.flush()
+                print(f"{n} pedidos, {aperto}, {distribuicao}, {modo_construcao}/{modo_busca}: "
+                      f"construção {medidas['tempo_construcao']:.3f} s, "
+                      f"{medidas['violacoes']} violações, lucro {medidas['lucro_final']:.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,158 +1,29 @@
+import os
 import time
-import random as rd
+from instancia import Instancia
+from resolver import resolver
+from saida import gravar_alocacao, resumo
 
-def busca_local(n, k, pedidos, container, X, tempo_limite):
-    soma_quantidades = [0 for _ in range(k)]
-    for i in range(n):
-        if X[i] != -1:
-             soma_quantidades[X[i]] += pedidos[i][0]
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
 
-    violacao = 0
-    for v in range(k):
-        if not (container[v][0] <= soma_quantidades[v] <= container[v][1]):
-            violacao += 1
+if __name__ == '__main__':
+    k = int(input("Digite a quantidade de containers: "))
+    instancia = Instancia.de_arquivo(os.path.join(DIRETORIO, 'input.txt'), formato='quantidades',
+                                     containers=k)
 
-    def intervalo_mudanca(v):
-        return container[v][0] - soma_quantidades[v], container[v][1] - soma_quantidades[v]
+    tempo_inicio = time.time()
 
-    def carga_valida(v):
-        min_delta, max_delta = intervalo_mudanca(v)
-        return min_delta * max_delta <= 0
+    tempo_limite = float(input("Digite o tempo limite de execução (em segundos): "))
 
-    def podem_trocar(v1, v2):
-        if carga_valida(v1) and carga_valida(v2):
-            return False
-        m1_min, m1_max = intervalo_mudanca(v1)
-        m2_min, m2_max = intervalo_mudanca(v2)
-        if m1_min * m2_max < 0 or m1_max * m2_min < 0:
-            return True
-        if (not carga_valida(v1) and carga_valida(v2)) or \
-           (carga_valida(v1) and not carga_valida(v2)):
-             if m1_min * (-m2_min) < 0 or m1_max * (-m2_max) < 0:
-                  return True
-        return False
+    solucao = resolver(instancia, tempo_limite, fase_lucro=False)
 
-    def escolher_container():
-        candidatos = []
-        for i in range(k):
-            for j in range(i + 1, k):
-                if podem_trocar(i, j):
-                    candidatos.append((i, j))
-        return rd.choice(candidatos) if candidatos else None
+    tempo_fim = time.time()
 
-    def mudanca_aceitavel(v1, v2):
-        r1_min, r1_max = intervalo_mudanca(v1)
-        r2_min_inv, r2_max_inv = intervalo_mudanca(v2)
-        r2_min, r2_max = -r2_max_inv, -r2_min_inv
-        min_aceitavel = max(r1_min, r2_min)
-        max_aceitavel = min(r1_max, r2_max)
-        return (min_aceitavel, max_aceitavel) if min_aceitavel <= max_aceitavel else None
+    metricas = resumo(solucao)
 
-    pedidos.append([0])
+    print("Pedidos Atendidos:", metricas['pedidos_atendidos'])
+    print("Carga Total:", metricas['carga_total'])
+    print("Tempo de Execução (s):", tempo_fim - tempo_inicio)
+    print("Containers Utilizados:", metricas['containers_utilizados'])
 
-    def escolher_pedidos_para_troca(v1, v2, intervalo_aceit):
-        if intervalo_aceit is None:
-             return None
-        min_mudanca, max_mudanca = intervalo_aceit
-        candidatos_v1 = [n] + [o for o in range(n) if X[o] == v1]
-        candidatos_v2 = [n] + [o for o in range(n) if X[o] == v2]
-        for i in candidatos_v1:
-            quant_i = pedidos[i][0]
-            for j in candidatos_v2:
-                if i == n and j == n: continue
-                quant_j = pedidos[j][0]
-                mudanca_liquida = quant_j - quant_i
-                if min_mudanca <= mudanca_liquida <= max_mudanca:
-                    return i, j, mudanca_liquida
-        return None
-
-    inicio_tempo = time.time()
-
-    while True:
-        if violacao == 0:
-            break
-        if time.time() - inicio_tempo >= tempo_limite:
-            print("Tempo limite atingido. Interrompendo a execução...")
-            break
-        par_container = escolher_container()
-        if par_container is None:
-            break
-        v1, v2 = par_container
-        intervalo_aceit = mudanca_aceitavel(v1, v2)
-        troca_escolhida = escolher_pedidos_para_troca(v1, v2, intervalo_aceit)
-        if troca_escolhida is not None:
-            pedido_i, pedido_j, mudanca_liq = troca_escolhida
-            pre_v1_valido = carga_valida(v1)
-            pre_v2_valido = carga_valida(v2)
-            if pedido_i != n: X[pedido_i] = v2
-            if pedido_j != n: X[pedido_j] = v1
-            soma_quantidades[v1] += mudanca_liq
-            soma_quantidades[v2] -= mudanca_liq
-            if not pre_v1_valido and carga_valida(v1): violacao -= 1
-            elif pre_v1_valido and not carga_valida(v1): violacao += 1
-            if not pre_v2_valido and carga_valida(v2): violacao -= 1
-            elif pre_v2_valido and not carga_valida(v2): violacao += 1
-
-    pedidos.pop()
-
-Pedidos = []
-
-with open('Primeiro Exercício/input.txt', 'r') as f:
-    for linha in f:
-        if linha.strip().isdigit():  # pula linha com número de pedidos
-            continue
-        valor = linha.strip()
-        if valor:
-            Pedidos.append([float(valor)])
-n = len(Pedidos)
-
-k = int(input("Digite a quantidade de containers: "))
-container = [[0.0, 1.0] for _ in range(k)]
-
-tempo_inicio = time.time()
-
-tempo_limite = float(input("Digite o tempo limite de execução (em segundos): "))
-
-pedidos_enumerados = sorted(enumerate(Pedidos), key=lambda x: x[1][0], reverse=True)
-container_enumerados = list(enumerate(container))
-
-carga_atual = [0] * k
-pedido_atendido = [False] * n
-X = [-1] * n
-
-for indice_container, container_atual in container_enumerados:
-    for indice_pedido, pedido_atual in pedidos_enumerados:
-        if not pedido_atendido[indice_pedido] and \
-           carga_atual[indice_container] + pedido_atual[0] <= container_atual[1]:
-            pedido_atendido[indice_pedido] = True
-            carga_atual[indice_container] += pedido_atual[0]
-            X[indice_pedido] = indice_container
-
-busca_local(n, k, Pedidos, container, X, tempo_limite)
-
-tempo_fim = time.time()
-
-contagem_pedidos = sum(1 for i in range(n) if X[i] != -1)
-carga_total = sum(Pedidos[i][0] for i in range(n) if X[i] != -1)
-
-print("Pedidos Atendidos:", contagem_pedidos)
-print("Carga Total:", carga_total)
-print("Tempo de Execução (s):", tempo_fim - tempo_inicio)
-
-containers_utilizados = len(set([X[i] for i in range(n) if X[i] != -1]))
-print("Containers Utilizados:", containers_utilizados)
-
-pedidos_por_container = [[] for _ in range(k)]
-for i in range(n):
-    if X[i] != -1:
-        pedidos_por_container[X[i]].append(i)
-
-with open("Primeiro Exercício/alocacao.txt", "w") as f:
-    for idx, pedidos in enumerate(pedidos_por_container):
-        f.write(f"Container {idx}:\n")
-        if pedidos:
-            for pedido in pedidos:
-                f.write(f"  Pedido {pedido}\n")
-        else:
-            f.write("  Nenhum pedido alocado\n")
-        f.write("\n")
\ No newline at end of file
+    gravar_alocacao(os.path.join(DIRETORIO, 'alocacao.txt'), solucao)
\ No newline at end of file
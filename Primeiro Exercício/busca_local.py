@@ -0,0 +1,313 @@
+import time
+import random as rd
+from bisect import bisect_left, bisect_right, insort
+from heapq import heapify, heappop, heappush
+
+def busca_local(instancia, solucao, tempo_limite, semente=None,
+                estrategia='aleatoria', max_parceiros=16, checkpoint=None, rastro=None):
+    # checkpoint: Checkpoint que recebe fotografias periódicas do X, das
+    # cargas e do gerador aleatório, e que ao retomar devolve o gerador ao
+    # ponto em que parou. rastro: Rastro que recebe as métricas da busca e é
+    # devolvido no fim; sem ele o laço não mede nada.
+    aleatorio = rd.Random(semente)
+    if checkpoint is not None:
+        checkpoint.restaurar_aleatorio(aleatorio)
+    n, k = instancia.n, instancia.k
+    quant = instancia.quantidades
+    lim_inf = instancia.limites_inferiores
+    lim_sup = instancia.limites_superiores
+    X = solucao.X
+    soma_quantidades = solucao.cargas
+
+    violacao = solucao.violacoes()
+
+    def intervalo_mudanca(v):
+        return lim_inf[v] - soma_quantidades[v], lim_sup[v] - soma_quantidades[v]
+
+    def carga_valida(v):
+        min_delta, max_delta = intervalo_mudanca(v)
+        return min_delta * max_delta <= 0
+
+    # Classes de container mantidas no índice incremental de pares.
+    # Um par pode trocar se for (sub, sobre) ou (violado, válido com folga);
+    # containers válidos com carga exatamente igual a min == max não trocam.
+    SUB, SOBRE, FOLGA, FIXO = 0, 1, 2, 3
+
+    def classificar(v):
+        min_delta, max_delta = intervalo_mudanca(v)
+        if min_delta * max_delta > 0:
+            return SUB if min_delta > 0 else SOBRE
+        if min_delta < 0 or max_delta > 0:
+            return FOLGA
+        return FIXO
+
+    membros = [[], [], []]
+    classe = [FIXO] * k
+    posicao = [0] * k
+
+    def inserir_indice(v):
+        c = classificar(v)
+        classe[v] = c
+        if c != FIXO:
+            posicao[v] = len(membros[c])
+            membros[c].append(v)
+
+    def remover_indice(v):
+        c = classe[v]
+        if c == FIXO:
+            return
+        lista = membros[c]
+        ultimo = lista.pop()
+        if ultimo != v:
+            lista[posicao[v]] = ultimo
+            posicao[ultimo] = posicao[v]
+
+    def reclassificar(v):
+        remover_indice(v)
+        inserir_indice(v)
+
+    for v in range(k):
+        inserir_indice(v)
+
+    def escolher_container():
+        # Sorteia uniformemente um par apto sem enumerar os k*(k-1)/2 pares:
+        # os pares aptos são sub x sobre mais violados x folga.
+        sub, sobre, folga = membros
+        n_cruzados = len(sub) * len(sobre)
+        total = n_cruzados + (len(sub) + len(sobre)) * len(folga)
+        if total == 0:
+            return None
+        r = aleatorio.randrange(total)
+        if r < n_cruzados:
+            v1, v2 = sub[r // len(sobre)], sobre[r % len(sobre)]
+        else:
+            r -= n_cruzados
+            i = r // len(folga)
+            v1 = sub[i] if i < len(sub) else sobre[i - len(sub)]
+            v2 = folga[r % len(folga)]
+        return (v1, v2) if v1 < v2 else (v2, v1)
+
+    def mudanca_aceitavel(v1, v2):
+        r1_min, r1_max = intervalo_mudanca(v1)
+        r2_min_inv, r2_max_inv = intervalo_mudanca(v2)
+        r2_min, r2_max = -r2_max_inv, -r2_min_inv
+        min_aceitavel = max(r1_min, r2_min)
+        max_aceitavel = min(r1_max, r2_max)
+        return (min_aceitavel, max_aceitavel) if min_aceitavel <= max_aceitavel else None
+
+    # Pedidos de cada container ordenados por quantidade, em listas paralelas
+    # mantidas a cada troca; o pedido "n" representa "nenhum pedido".
+    quant_ordenadas = [[] for _ in range(k)]
+    pedidos_ordenados = [[] for _ in range(k)]
+    for i in sorted((i for i in range(n) if X[i] != -1), key=quant.__getitem__):
+        quant_ordenadas[X[i]].append(quant[i])
+        pedidos_ordenados[X[i]].append(i)
+
+    def inserir_pedido(v, i):
+        pos = bisect_right(quant_ordenadas[v], quant[i])
+        quant_ordenadas[v].insert(pos, quant[i])
+        pedidos_ordenados[v].insert(pos, i)
+
+    def remover_pedido(v, i):
+        pos = bisect_left(quant_ordenadas[v], quant[i])
+        while pedidos_ordenados[v][pos] != i:
+            pos += 1
+        del quant_ordenadas[v][pos]
+        del pedidos_ordenados[v][pos]
+
+    def buscar_parceiro(v, quant_i, min_mudanca, max_mudanca):
+        # Primeiro pedido j de v com min <= q_j - q_i <= max.
+        quants = quant_ordenadas[v]
+        pos = max(bisect_left(quants, min_mudanca + quant_i) - 1, 0)
+        while pos < len(quants):
+            mudanca_liquida = quants[pos] - quant_i
+            if mudanca_liquida > max_mudanca:
+                break
+            if mudanca_liquida >= min_mudanca:
+                return pedidos_ordenados[v][pos], mudanca_liquida
+            pos += 1
+        return None
+
+    def escolher_pedidos_para_troca(v1, v2, intervalo_aceit):
+        if intervalo_aceit is None:
+             return None
+        min_mudanca, max_mudanca = intervalo_aceit
+        parceiro = buscar_parceiro(v2, 0, min_mudanca, max_mudanca)
+        if parceiro is not None:
+            return n, parceiro[0], parceiro[1]
+        for i, quant_i in zip(pedidos_ordenados[v1], quant_ordenadas[v1]):
+            if min_mudanca <= -quant_i <= max_mudanca:
+                return i, n, -quant_i
+            parceiro = buscar_parceiro(v2, quant_i, min_mudanca, max_mudanca)
+            if parceiro is not None:
+                return i, parceiro[0], parceiro[1]
+        return None
+
+    # Estratégia 'prioridade': em vez de sortear um par apto, trabalha sempre
+    # no container mais violado (heap com remoção preguiçosa por versão) e o
+    # combina com os containers capazes de receber ou doar um pedido de
+    # verdade (listas ordenadas de folga superior e inferior); sem nenhum,
+    # sorteia um par do índice de pares, como a estratégia padrão.
+    def magnitude(v):
+        min_delta, max_delta = intervalo_mudanca(v)
+        return max(min_delta, -max_delta, 0)
+
+    def pode_doar(v2, min_mudanca, max_mudanca):
+        # v2 tem um pedido com quantidade entre min e max.
+        quants = quant_ordenadas[v2]
+        pos = bisect_left(quants, min_mudanca)
+        return pos < len(quants) and quants[pos] <= max_mudanca
+
+    versao = [0] * k
+    heap = []
+    travados = []
+    folga_sup = []
+    folga_inf = []
+    chave_sup = [None] * k
+    chave_inf = [None] * k
+
+    def empurrar(v):
+        versao[v] += 1
+        mag = magnitude(v)
+        if mag > 0:
+            heappush(heap, (-mag, versao[v], v))
+
+    def atualizar_folgas(v):
+        if chave_sup[v] is not None:
+            del folga_sup[bisect_left(folga_sup, chave_sup[v])]
+            del folga_inf[bisect_left(folga_inf, chave_inf[v])]
+        chave_sup[v] = (lim_sup[v] - soma_quantidades[v], v)
+        chave_inf[v] = (soma_quantidades[v] - lim_inf[v], v)
+        insort(folga_sup, chave_sup[v])
+        insort(folga_inf, chave_inf[v])
+
+    if estrategia == 'prioridade':
+        for v in range(k):
+            atualizar_folgas(v)
+            if magnitude(v) > 0:
+                heap.append((-magnitude(v), versao[v], v))
+        heapify(heap)
+
+    def escolher_movimento_prioridade():
+        while heap:
+            _, ver, v1 = heap[0]
+            if ver != versao[v1]:
+                heappop(heap)
+                continue
+            min_delta, max_delta = intervalo_mudanca(v1)
+            if min_delta > 0:
+                # Sub-carregado: o doador precisa de um pedido entre o
+                # déficit e a própria sobra acima do mínimo (e que caiba em
+                # v1). Depois dos max_parceiros primeiros, que também podem
+                # trocar pedidos, só são tentados os que podem doar sozinhos.
+                folgas, necessario = folga_inf, min_delta
+            else:
+                # Sobrecarregado: o parceiro precisa de espaço para o menor
+                # pedido de v1 que sozinho resolve o excesso.
+                quants = quant_ordenadas[v1]
+                pos = bisect_left(quants, -max_delta)
+                folgas = folga_sup
+                necessario = quants[pos] if pos < len(quants) else float('inf')
+            tentados = 0
+            for sobra, v2 in folgas[bisect_left(folgas, (necessario, -1)):]:
+                if v2 == v1:
+                    continue
+                if tentados >= max_parceiros and min_delta > 0 and \
+                   not pode_doar(v2, min_delta, min(sobra, max_delta)):
+                    continue
+                tentados += 1
+                troca = escolher_pedidos_para_troca(v1, v2, mudanca_aceitavel(v1, v2))
+                if troca is not None:
+                    return v1, v2, troca
+            heappop(heap)
+            travados.append(v1)
+        # Nenhum container violado tem parceiro direto: um par sorteado do
+        # índice ainda pode abrir espaço para eles.
+        par_container = escolher_container()
+        if par_container is None:
+            return None
+        v1, v2 = par_container
+        return v1, v2, escolher_pedidos_para_troca(v1, v2, mudanca_aceitavel(v1, v2))
+
+    def atualizar_prioridade(v1, v2):
+        atualizar_folgas(v1)
+        atualizar_folgas(v2)
+        empurrar(v1)
+        empurrar(v2)
+        # As folgas mudaram, então containers sem parceiro podem ter ganhado um.
+        for v in travados:
+            empurrar(v)
+        travados.clear()
+
+    if rastro is not None:
+        # Mede a escolha dos pedidos por dentro, inclusive quando ela é
+        # chamada pela estratégia 'prioridade'.
+        escolher_pedidos_sem_rastro = escolher_pedidos_para_troca
+
+        def escolher_pedidos_para_troca(v1, v2, intervalo_aceit):
+            inicio = time.perf_counter()
+            troca = escolher_pedidos_sem_rastro(v1, v2, intervalo_aceit)
+            rastro.tempo_escolha_pedidos += time.perf_counter() - inicio
+            return troca
+
+        rastro.iniciar(violacao)
+
+    inicio_tempo = time.time()
+
+    while True:
+        if violacao == 0:
+            break
+        agora = time.time()
+        if agora - inicio_tempo >= tempo_limite:
+            print("Tempo limite atingido. Interrompendo a execução...")
+            if checkpoint is not None:
+                checkpoint.gravar(solucao, 'busca', aleatorio)
+            break
+        # As trocas nunca aumentam as violações, então o X atual é sempre
+        # a melhor solução vista e pode ser gravado como está.
+        if checkpoint is not None and agora >= checkpoint.proximo:
+            checkpoint.gravar(solucao, 'busca', aleatorio)
+        if rastro is not None:
+            inicio_escolha = time.perf_counter()
+        if estrategia == 'prioridade':
+            movimento = escolher_movimento_prioridade()
+            if movimento is None:
+                break
+            v1, v2, troca_escolhida = movimento
+        else:
+            par_container = escolher_container()
+            if par_container is None:
+                break
+            v1, v2 = par_container
+            intervalo_aceit = mudanca_aceitavel(v1, v2)
+            troca_escolhida = escolher_pedidos_para_troca(v1, v2, intervalo_aceit)
+        if rastro is not None:
+            tempo_escolha = time.perf_counter() - inicio_escolha
+        if troca_escolhida is not None:
+            pedido_i, pedido_j, mudanca_liq = troca_escolhida
+            pre_v1_valido = carga_valida(v1)
+            pre_v2_valido = carga_valida(v2)
+            if pedido_i != n:
+                X[pedido_i] = v2
+                remover_pedido(v1, pedido_i)
+                inserir_pedido(v2, pedido_i)
+            if pedido_j != n:
+                X[pedido_j] = v1
+                remover_pedido(v2, pedido_j)
+                inserir_pedido(v1, pedido_j)
+            soma_quantidades[v1] += mudanca_liq
+            soma_quantidades[v2] -= mudanca_liq
+            if not pre_v1_valido and carga_valida(v1): violacao -= 1
+            elif pre_v1_valido and not carga_valida(v1): violacao += 1
+            if not pre_v2_valido and carga_valida(v2): violacao -= 1
+            elif pre_v2_valido and not carga_valida(v2): violacao += 1
+            reclassificar(v1)
+            reclassificar(v2)
+            if estrategia == 'prioridade':
+                atualizar_prioridade(v1, v2)
+        if rastro is not None:
+            rastro.registrar(troca_escolhida is not None, violacao, agora, tempo_escolha)
+
+    if rastro is not None:
+        rastro.finalizar(violacao)
+    return rastro
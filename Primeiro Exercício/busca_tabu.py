@@ -0,0 +1,159 @@
+import time
+import random as rd
+
+
+def busca_tabu(instancia, solucao, tempo_limite, semente=None,
+               duracao_tabu=10, amostra_parceiros=10, amostra_pedidos=8):
+    # Alternativa à busca_local para corrigir as violações de capacidade.
+    # A cada iteração escolhe um container violado e aplica o melhor
+    # movimento não tabu (transferência ou troca de pedidos com um parceiro),
+    # mesmo que piore. Desfazer um movimento fica proibido por duracao_tabu
+    # iterações, salvo se levar à menor violação já vista (aspiração). A
+    # violação é comparada pelo número de containers violados e, no empate,
+    # pela soma do quanto cada um está fora do intervalo.
+    aleatorio = rd.Random(semente)
+    n, k = instancia.n, instancia.k
+    quant = instancia.quantidades
+    lim_inf = instancia.limites_inferiores
+    lim_sup = instancia.limites_superiores
+    X = solucao.X
+    carga = solucao.cargas
+
+    membros = [[] for _ in range(k)]
+    posicao = [0] * n
+    for i in range(n):
+        if X[i] != -1:
+            posicao[i] = len(membros[X[i]])
+            membros[X[i]].append(i)
+
+    def excesso(v, c):
+        return max(lim_inf[v] - c, c - lim_sup[v], 0)
+
+    violados = []
+    posicao_violado = [-1] * k
+
+    def atualizar_violado(v):
+        violado = excesso(v, carga[v]) > 0
+        if violado and posicao_violado[v] == -1:
+            posicao_violado[v] = len(violados)
+            violados.append(v)
+        elif not violado and posicao_violado[v] != -1:
+            ultimo = violados.pop()
+            if ultimo != v:
+                violados[posicao_violado[v]] = ultimo
+                posicao_violado[ultimo] = posicao_violado[v]
+            posicao_violado[v] = -1
+
+    for v in range(k):
+        atualizar_violado(v)
+    violacao_total = (len(violados), sum(excesso(v, carga[v]) for v in range(k)))
+
+    def mover(i, destino):
+        origem = X[i]
+        lista = membros[origem]
+        ultimo = lista.pop()
+        if ultimo != i:
+            lista[posicao[i]] = ultimo
+            posicao[ultimo] = posicao[i]
+        posicao[i] = len(membros[destino])
+        membros[destino].append(i)
+        carga[origem] -= quant[i]
+        carga[destino] += quant[i]
+        X[i] = destino
+        return origem
+
+    def amostrar(v):
+        lista = membros[v]
+        if len(lista) <= amostra_pedidos:
+            return lista
+        return aleatorio.sample(lista, amostra_pedidos)
+
+    def somar(violacao, delta):
+        return violacao[0] + delta[0], violacao[1] + delta[1]
+
+    # Atributo (pedido, origem, destino) -> iteração até a qual é tabu.
+    tabu = {}
+    iteracao = 0
+
+    def eh_tabu(i, origem, destino):
+        return tabu.get((i, origem, destino), -1) >= iteracao
+
+    # Movimentos desde a melhor solução vista, para voltar a ela no fim.
+    historico = []
+    limite_historico = max(n, 10000)
+    melhor_total = violacao_total
+
+    def voltar_ao_melhor():
+        nonlocal violacao_total
+        while historico:
+            pedido, origem = historico.pop()
+            destino = X[pedido]
+            mover(pedido, origem)
+            atualizar_violado(origem)
+            atualizar_violado(destino)
+        violacao_total = melhor_total
+
+    inicio_tempo = time.time()
+
+    while violados and k > 1:
+        if time.time() - inicio_tempo >= tempo_limite:
+            print("Tempo limite atingido. Interrompendo a execução...")
+            break
+        iteracao += 1
+        v = violados[aleatorio.randrange(len(violados))]
+        pedidos_v = amostrar(v)
+
+        melhor_movimento = None
+        melhor_delta = (float('inf'), float('inf'))
+        for _ in range(amostra_parceiros):
+            w = aleatorio.randrange(k - 1)
+            if w >= v:
+                w += 1
+            pedidos_w = amostrar(w)
+            excesso_v, excesso_w = excesso(v, carga[v]), excesso(w, carga[w])
+            base_contagem = (excesso_v > 0) + (excesso_w > 0)
+            # (pedido de v ou None, pedido de w ou None): transferências
+            # v -> w, w -> v e trocas entre os dois containers.
+            candidatos = [(i, None) for i in pedidos_v] + [(None, j) for j in pedidos_w]
+            candidatos += [(i, j) for i in pedidos_v for j in pedidos_w]
+            for i, j in candidatos:
+                mudanca = (quant[j] if j is not None else 0) - (quant[i] if i is not None else 0)
+                novo_v = excesso(v, carga[v] + mudanca)
+                novo_w = excesso(w, carga[w] - mudanca)
+                delta = ((novo_v > 0) + (novo_w > 0) - base_contagem,
+                         novo_v + novo_w - excesso_v - excesso_w)
+                if delta >= melhor_delta:
+                    continue
+                proibido = (i is not None and eh_tabu(i, v, w)) or \
+                           (j is not None and eh_tabu(j, w, v))
+                if proibido and somar(violacao_total, delta) >= melhor_total:
+                    continue
+                melhor_delta = delta
+                melhor_movimento = (i, j, w)
+
+        if melhor_movimento is None:
+            continue
+
+        i, j, w = melhor_movimento
+        for pedido, destino in ((i, w), (j, v)):
+            if pedido is None:
+                continue
+            origem = mover(pedido, destino)
+            historico.append((pedido, origem))
+            tabu[(pedido, destino, origem)] = iteracao + duracao_tabu
+        violacao_total = somar(violacao_total, melhor_delta)
+        atualizar_violado(v)
+        atualizar_violado(w)
+
+        if violacao_total < melhor_total:
+            melhor_total = violacao_total
+            historico.clear()
+        elif len(historico) > limite_historico:
+            voltar_ao_melhor()
+
+        if len(tabu) > 4 * limite_historico:
+            tabu = {chave: fim for chave, fim in tabu.items() if fim >= iteracao}
+
+    # Volta para a melhor solução vista (a atual, se terminou sem violações).
+    if violados:
+        voltar_ao_melhor()
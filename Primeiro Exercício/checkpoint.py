@@ -0,0 +1,76 @@
+import os
+import time
+
+import numpy as np
+
+from instancia import Solucao
+
+# Fases gravadas, na ordem em que o resolver passa por elas.
+FASES = ('busca', 'lucro')
+
+
+class Checkpoint:
+    # Fotografia periódica da busca em um .npz binário (sem pickle): X,
+    # cargas, estado do gerador aleatório da busca_local, fase do resolver e
+    # as métricas da melhor solução. Com retomar, o resolver parte da última
+    # fotografia em vez de refazer a construção e a correção.
+    def __init__(self, caminho, intervalo=60.0):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.proximo = time.time() + intervalo
+        self.solucao = None
+        self.fase = None
+        self.estado_aleatorio = None
+        self.tempo_anterior = 0.0
+        self._inicio = time.time()
+
+    def carregar(self, instancia):
+        # Devolve False (e começa do zero) se ainda não há fotografia.
+        if not os.path.exists(self.caminho):
+            return False
+        with np.load(self.caminho) as dados:
+            X, cargas = dados['X'], dados['cargas']
+            if len(X) != instancia.n or len(cargas) != instancia.k:
+                raise ValueError(f"checkpoint {self.caminho} é de outra instância "
+                                 f"({len(X)} pedidos, {len(cargas)} containers)")
+            self.fase = FASES[int(dados['fase'])]
+            self.tempo_anterior = float(dados['tempo'])
+            if len(dados['aleatorio']):
+                estado = dados['aleatorio'].tolist()
+                gauss = float(dados['gauss'])
+                self.estado_aleatorio = (estado[0], tuple(estado[1:]),
+                                         None if np.isnan(gauss) else gauss)
+        self.solucao = Solucao(instancia, X)
+        # As cargas gravadas são as mantidas pela busca; usá-las evita que a
+        # soma refeita do zero difira no último bit.
+        np.frombuffer(self.solucao.cargas, dtype=np.float64)[:] = cargas
+        return True
+
+    def restaurar_aleatorio(self, aleatorio):
+        # Uso único: só a busca retomada continua a sequência gravada.
+        if self.estado_aleatorio is not None:
+            aleatorio.setstate(self.estado_aleatorio)
+            self.estado_aleatorio = None
+
+    def gravar(self, solucao, fase, aleatorio=None):
+        if aleatorio is not None:
+            versao, estado, gauss = aleatorio.getstate()
+            vetor_aleatorio = np.array((versao,) + estado, dtype=np.int64)
+            gauss = np.nan if gauss is None else gauss
+        else:
+            vetor_aleatorio = np.empty(0, dtype=np.int64)
+            gauss = np.nan
+        temporario = f'{self.caminho}.{os.getpid()}.tmp'
+        with open(temporario, 'wb') as f:
+            np.savez(f,
+                     X=np.frombuffer(solucao.X, dtype=np.int64),
+                     cargas=np.frombuffer(solucao.cargas, dtype=np.float64),
+                     aleatorio=vetor_aleatorio,
+                     gauss=np.float64(gauss),
+                     fase=np.int64(FASES.index(fase)),
+                     violacoes=np.int64(solucao.violacoes()),
+                     lucro=np.float64(solucao.lucro()),
+                     tempo=np.float64(self.tempo_anterior + time.time() - self._inicio))
+        os.replace(temporario, self.caminho)
+        self.proximo = time.time() + self.intervalo
+
@@ -0,0 +1,145 @@
+from bisect import bisect_left, insort
+
+import numpy as np
+
+
+def guloso_first_fit(quantidades, limites_inferiores, limites_superiores, ordem_containers=None):
+    # Mesmo first-fit decrescente do laço original (containers por limite
+    # inferior decrescente, pedidos por quantidade decrescente), mas sobre
+    # arrays: os pedidos já atendidos são marcados e pulados, e cada
+    # container é preenchido em blocos com soma acumulada. ordem_containers
+    # permite trocar a ordem dos containers (usado pela multipartida).
+    quantidades = np.asarray(quantidades, dtype=np.float64)
+    limites_inferiores = np.asarray(limites_inferiores, dtype=np.float64)
+    limites_superiores = np.asarray(limites_superiores, dtype=np.float64)
+
+    X = np.full(len(quantidades), -1, dtype=np.int64)
+    restantes = np.argsort(-quantidades, kind='stable')
+    quant = quantidades[restantes]
+    negativas = -quant
+    atendido = np.zeros(len(quant), dtype=bool)
+    inicio = 0
+    marcados = 0
+
+    if ordem_containers is None:
+        ordem_containers = np.argsort(-limites_inferiores, kind='stable')
+
+    for indice_container in ordem_containers:
+        if inicio >= len(quant):
+            break
+        pegos = _preencher_container(quant, negativas, atendido, inicio, limites_superiores[indice_container])
+        if len(pegos) == 0:
+            continue
+        X[restantes[pegos]] = indice_container
+        atendido[pegos] = True
+        marcados += len(pegos)
+        inicio = _proximo_livre(atendido, inicio)
+
+        # Compacta só de vez em quando: a cópia custa O(n), então fazê-la a
+        # cada container tornaria a construção O(k*n) de novo.
+        if marcados > (len(quant) - inicio) // 4:
+            livres = ~atendido[inicio:]
+            restantes = restantes[inicio:][livres]
+            quant = quant[inicio:][livres]
+            negativas = -quant
+            atendido = np.zeros(len(quant), dtype=bool)
+            inicio = 0
+            marcados = 0
+
+    return X
+
+
+def _proximo_livre(atendido, inicio, bloco=4096):
+    m = len(atendido)
+    while inicio < m:
+        trecho = atendido[inicio:inicio + bloco]
+        if not trecho.all():
+            return inicio + int(np.argmin(trecho))
+        inicio += bloco
+    return m
+
+
+def _preencher_container(quant, negativas, atendido, inicio, capacidade):
+    # Posições de quant (decrescente) que o laço sequencial
+    # "carga + q <= capacidade" aceitaria, na mesma ordem e com a mesma
+    # aritmética: np.cumsum soma em sequência a partir da carga atual.
+    m = len(quant)
+    pegos = []
+    carga = 0.0
+    pos = inicio
+    janela = 64
+    while pos < m:
+        base = pos
+        pos += int(np.searchsorted(negativas[pos:], -(capacidade - carga), side='left'))
+        while pos > base and carga + quant[pos - 1] <= capacidade:
+            pos -= 1
+        while pos < m and not (carga + quant[pos] <= capacidade):
+            pos += 1
+        if pos >= m:
+            break
+        fim = min(pos + janela, m)
+        livres = pos + np.flatnonzero(~atendido[pos:fim])
+        if len(livres) == 0:
+            pos = fim
+            continue
+        cargas = np.cumsum(np.concatenate(([carga], quant[livres])))[1:]
+        cabem = int(np.count_nonzero(cargas <= capacidade))
+        pegos.append(livres[:cabem])
+        carga = cargas[cabem - 1]
+        if cabem == len(livres):
+            janela *= 2
+            pos = fim
+        else:
+            pos = int(livres[cabem])
+    if not pegos:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(pegos)
+
+
+def guloso_best_fit(quantidades, limites_inferiores, limites_superiores):
+    # Best-fit decrescente orientado a pedidos: cada pedido, do maior para o
+    # menor, vai para o container com a menor folga que ainda o comporta,
+    # dando preferência aos containers abaixo do limite inferior. As folgas
+    # ficam em listas ordenadas, então cada pedido custa O(log k) na busca.
+    quantidades = np.asarray(quantidades, dtype=np.float64)
+    limites_inferiores = np.asarray(limites_inferiores, dtype=np.float64).tolist()
+    limites_superiores = np.asarray(limites_superiores, dtype=np.float64).tolist()
+    k = len(limites_superiores)
+
+    X = np.full(len(quantidades), -1, dtype=np.int64)
+    carga = [0.0] * k
+    abaixo_minimo = []
+    demais = []
+    for v in range(k):
+        folga = (limites_superiores[v], v)
+        if limites_inferiores[v] > 0:
+            abaixo_minimo.append(folga)
+        else:
+            demais.append(folga)
+    abaixo_minimo.sort()
+    demais.sort()
+
+    def melhor_container(folgas, q):
+        pos = bisect_left(folgas, (q, -1))
+        # A folga é só a chave de ordenação; o critério de aceitação é o
+        # mesmo "carga + q <= limite superior" do resto do código.
+        while pos < len(folgas) and not (carga[folgas[pos][1]] + q <= limites_superiores[folgas[pos][1]]):
+            pos += 1
+        return pos if pos < len(folgas) else None
+
+    for indice_pedido in np.argsort(-quantidades, kind='stable').tolist():
+        q = float(quantidades[indice_pedido])
+        folgas = abaixo_minimo
+        pos = melhor_container(folgas, q)
+        if pos is None:
+            folgas = demais
+            pos = melhor_container(folgas, q)
+            if pos is None:
+                continue
+        v = folgas.pop(pos)[1]
+        carga[v] += q
+        X[indice_pedido] = v
+        folga = (limites_superiores[v] - carga[v], v)
+        insort(abaixo_minimo if carga[v] < limites_inferiores[v] else demais, folga)
+
+    return X
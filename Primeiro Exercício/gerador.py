@@ -0,0 +1,84 @@
+import argparse
+
+import numpy as np
+
+# Razão mínimo / máximo dos containers para cada aperto dos limites
+# inferiores. O input.txt original fica perto de 'medio'.
+APERTOS = {
+    'folgado': (0.0, 0.3),
+    'medio': (0.2, 0.6),
+    'apertado': (0.6, 0.95),
+}
+DISTRIBUICOES = ('uniforme', 'bimodal')
+# Linhas formatadas por vez na gravação, para não montar o texto inteiro
+LINHAS_POR_BLOCO = 1 << 16
+
+
+def gerar_instancia(n, k=None, semente=0, aperto='medio', distribuicao='uniforme'):
+    # Gera (pedidos n x 2, container k x 2) na mesma escala do input.txt:
+    # quantidades em (0, 0.17], lucros inteiros de 1 a 160 e containers com
+    # máximo entre 0.34 e 1. Com 'bimodal', um quinto dos pedidos é grande
+    # (0.25 a 0.5), o que torna o encaixe nos limites mais difícil.
+    if aperto not in APERTOS:
+        raise ValueError(f"aperto deve ser um de {sorted(APERTOS)}")
+    if distribuicao not in DISTRIBUICOES:
+        raise ValueError(f"distribuicao deve ser uma de {DISTRIBUICOES}")
+    aleatorio = np.random.default_rng(semente)
+    k = max(n // 20, 1) if k is None else k
+
+    quantidades = aleatorio.uniform(0.01, 0.17, n)
+    if distribuicao == 'bimodal':
+        grandes = aleatorio.random(n) < 0.2
+        quantidades[grandes] = aleatorio.uniform(0.25, 0.5, int(grandes.sum()))
+    pedidos = np.empty((n, 2))
+    # Seis casas, como no input.txt; o mínimo evita um "0.000000" que o
+    # formato 'quantidades' leria como contagem.
+    pedidos[:, 0] = np.maximum(np.round(quantidades, 6), 1e-6)
+    pedidos[:, 1] = aleatorio.integers(1, 161, n)
+
+    container = np.empty((k, 2))
+    container[:, 1] = np.round(aleatorio.uniform(0.34, 1.0, k), 6)
+    razao = aleatorio.uniform(*APERTOS[aperto], k)
+    container[:, 0] = np.round(container[:, 1] * razao, 6)
+    return pedidos, container
+
+
+def gravar_instancia(caminho, pedidos, container, formato='lucro'):
+    # Grava no formato lido por ler_instancia: 'lucro' ("n k", pedidos
+    # "quantidade lucro", containers "mínimo máximo") ou 'quantidades'
+    # ("n" e uma quantidade por linha; os containers são dados à parte).
+    with open(caminho, 'w') as f:
+        if formato == 'lucro':
+            f.write(f"{len(pedidos)} {len(container)}\n")
+            _gravar_linhas(f, pedidos, "%.6f %.1f\n")
+            _gravar_linhas(f, container, "%.6f %.6f\n")
+        else:
+            f.write(f"{len(pedidos)}\n")
+            _gravar_linhas(f, pedidos[:, :1], "%.6f\n")
+
+
+def _gravar_linhas(f, valores, formato_linha):
+    for inicio in range(0, len(valores), LINHAS_POR_BLOCO):
+        bloco = valores[inicio:inicio + LINHAS_POR_BLOCO]
+        f.write((formato_linha * len(bloco)) % tuple(bloco.ravel().tolist()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera instâncias de bin-packing com semente.")
+    parser.add_argument('saida', help="arquivo de instância a gravar")
+    parser.add_argument('--pedidos', type=int, required=True)
+    parser.add_argument('--containers', type=int, default=None,
+                        help="padrão: um container para cada 20 pedidos")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--aperto', choices=sorted(APERTOS), default='medio')
+    parser.add_argument('--distribuicao', choices=DISTRIBUICOES, default='uniforme')
+    parser.add_argument('--formato', choices=['lucro', 'quantidades'], default='lucro')
+    args = parser.parse_args(argv)
+
+    pedidos, container = gerar_instancia(args.pedidos, args.containers, args.semente,
+                                         args.aperto, args.distribuicao)
+    gravar_instancia(args.saida, pedidos, container, args.formato)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+import os
+from array import array
+
+import numpy as np
+
+
+def ler_instancia(caminho, formato='lucro', usar_cache=True):
+    # Lê a instância em arrays NumPy: pedidos (n x 2 com quantidade e lucro,
+    # ou n x 1 no formato 'quantidades') e container (k x 2 com os limites;
+    # vazio no formato 'quantidades'). O texto é convertido de uma vez só e
+    # o resultado fica em um .npy ao lado do arquivo, lido por mmap enquanto
+    # for mais novo que o texto.
+    cache = f'{caminho}.{formato}.npy'
+    if usar_cache and os.path.exists(cache) and \
+       os.path.getmtime(cache) >= os.path.getmtime(caminho):
+        return _separar(np.load(cache, mmap_mode='r'))
+
+    with open(caminho, 'r') as f:
+        texto = f.read()
+    if formato == 'lucro':
+        valores = np.fromstring(texto, dtype=np.float64, sep=' ')
+        n, k = int(valores[0]), int(valores[1])
+        pedidos = valores[2:2 + 2 * n].reshape(n, 2)
+        container = valores[2 + 2 * n:2 + 2 * n + 2 * k].reshape(k, 2)
+    else:
+        # Como no laço original, linhas só com dígitos (contagem de pedidos)
+        # são ignoradas.
+        tokens = np.array(texto.split())
+        if len(tokens):
+            tokens = tokens[~np.char.isdigit(tokens)]
+        pedidos = tokens.astype(np.float64).reshape(-1, 1)
+        container = np.empty((0, 2), dtype=np.float64)
+
+    if usar_cache:
+        _gravar_cache(cache, pedidos, container)
+    return pedidos, container
+
+
+def _gravar_cache(cache, pedidos, container):
+    # Layout plano: [n, colunas dos pedidos, k, pedidos..., container...].
+    valores = np.concatenate((
+        [len(pedidos), pedidos.shape[1], len(container)],
+        pedidos.ravel(),
+        container.ravel(),
+    ))
+    temporario = f'{cache}.{os.getpid()}.tmp'
+    try:
+        with open(temporario, 'wb') as f:
+            np.save(f, valores)
+        os.replace(temporario, cache)
+    except OSError:
+        # Sem permissão de escrita só perdemos o cache.
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def _separar(valores):
+    n, colunas, k = int(valores[0]), int(valores[1]), int(valores[2])
+    fim_pedidos = 3 + n * colunas
+    pedidos = valores[3:fim_pedidos].reshape(n, colunas)
+    container = valores[fim_pedidos:fim_pedidos + 2 * k].reshape(k, 2)
+    return pedidos, container
+
+
+class Instancia:
+    # Dados do problema em arrays contíguos e tipados (8 bytes por valor),
+    # copiados na construção: quem chama pode alterar os seus dados sem
+    # afetar a instância, e nenhum algoritmo altera a instância.
+    __slots__ = ('quantidades', 'lucros', 'limites_inferiores', 'limites_superiores')
+
+    def __init__(self, quantidades, lucros, limites_inferiores, limites_superiores):
+        self.quantidades = _array_double(quantidades)
+        self.lucros = _array_double(lucros)
+        self.limites_inferiores = _array_double(limites_inferiores)
+        self.limites_superiores = _array_double(limites_superiores)
+
+    @classmethod
+    def de_arrays(cls, pedidos, container):
+        # pedidos: n x 2 (quantidade, lucro) ou n x 1 (só quantidade, e então
+        # o objetivo é a carga total); container: k x 2 (mínimo, máximo).
+        pedidos = np.asarray(pedidos, dtype=np.float64).reshape(len(pedidos), -1)
+        container = np.asarray(container, dtype=np.float64).reshape(len(container), 2)
+        lucros = pedidos[:, 1] if pedidos.shape[1] > 1 else pedidos[:, 0]
+        return cls(pedidos[:, 0], lucros, container[:, 0], container[:, 1])
+
+    @classmethod
+    def de_arquivo(cls, caminho, formato='lucro', usar_cache=True, containers=0):
+        # O formato 'quantidades' não traz containers: são usados
+        # `containers` containers de capacidade [0, 1].
+        pedidos, container = ler_instancia(caminho, formato, usar_cache)
+        if formato == 'quantidades':
+            container = [[0.0, 1.0]] * containers
+        return cls.de_arrays(pedidos, container)
+
+    @property
+    def n(self):
+        return len(self.quantidades)
+
+    @property
+    def k(self):
+        return len(self.limites_superiores)
+
+    def como_numpy(self, campo):
+        # Visão NumPy sem cópia de um dos arrays, para as fases vetorizadas.
+        return np.frombuffer(getattr(self, campo), dtype=np.float64)
+
+
+class Solucao:
+    # Atribuição X (container de cada pedido, -1 se não atendido) e a carga
+    # de cada container, que os algoritmos mantêm em dia a cada movimento.
+    __slots__ = ('instancia', 'X', 'cargas')
+
+    def __init__(self, instancia, X=None):
+        self.instancia = instancia
+        n = instancia.n
+        if X is None:
+            self.X = array('q', [-1]) * n
+        elif isinstance(X, np.ndarray):
+            self.X = array('q')
+            self.X.frombytes(np.ascontiguousarray(X, dtype=np.int64).tobytes())
+        else:
+            self.X = array('q', X)
+        if len(self.X) != n:
+            raise ValueError(f"X tem {len(self.X)} posições, mas a instância tem {n} pedidos")
+        self.recalcular_cargas()
+
+    def recalcular_cargas(self):
+        self.cargas = array('d', bytes(8 * self.instancia.k))
+        quant = self.instancia.quantidades
+        for i, v in enumerate(self.X):
+            if v != -1:
+                self.cargas[v] += quant[i]
+
+    def copia(self):
+        outra = Solucao.__new__(Solucao)
+        outra.instancia = self.instancia
+        outra.X = array('q', self.X)
+        outra.cargas = array('d', self.cargas)
+        return outra
+
+    def violacoes(self):
+        inst = self.instancia
+        return sum(
+            1 for v in range(inst.k)
+            if not (inst.limites_inferiores[v] <= self.cargas[v] <= inst.limites_superiores[v])
+        )
+
+    def lucro(self):
+        lucros = self.instancia.lucros
+        return sum(lucros[i] for i, v in enumerate(self.X) if v != -1)
+
+    def atendidos(self):
+        return sum(1 for v in self.X if v != -1)
+
+
+def _array_double(valores):
+    if isinstance(valores, np.ndarray):
+        resultado = array('d')
+        resultado.frombytes(np.ascontiguousarray(valores, dtype=np.float64).tobytes())
+        return resultado
+    return array('d', valores)
@@ -0,0 +1,90 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from instancia import Instancia
+from resolver import resolver
+from saida import resumo
+
+
+def resolver_arquivo(caminho, tempo_limite, formato='lucro', containers=0, semente=None,
+                     modo_construcao='first_fit', modo_busca='primeira_melhora',
+                     fase_lucro=True, intervalo_checkpoint=None, retomar=False,
+                     reparo_minimos=True):
+    # Resolve uma instância em arquivo e devolve o registro de resultado.
+    # Com intervalo_checkpoint, o progresso vai para <arquivo>.checkpoint.npz.
+    inicio = time.time()
+    instancia = Instancia.de_arquivo(caminho, formato, containers=containers)
+    # Os avisos da busca vão para stderr para não misturar com o JSONL.
+    with contextlib.redirect_stdout(sys.stderr):
+        solucao = resolver(instancia, tempo_limite, semente=semente,
+                           modo_construcao=modo_construcao, modo_busca=modo_busca,
+                           fase_lucro=fase_lucro,
+                           checkpoint=f'{caminho}.checkpoint.npz' if intervalo_checkpoint else None,
+                           intervalo_checkpoint=intervalo_checkpoint, retomar=retomar,
+                           reparo_minimos=reparo_minimos)
+    return {'arquivo': caminho, **resumo(solucao), 'tempo_execucao': time.time() - inicio}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resolve várias instâncias de bin-packing em paralelo, "
+                    "gravando um registro JSON por instância.")
+    parser.add_argument('arquivos', nargs='+', help="arquivos de instância")
+    parser.add_argument('--tempo-limite', type=float, required=True,
+                        help="tempo limite por instância, em segundos")
+    parser.add_argument('--formato', choices=['lucro', 'quantidades'], default='lucro')
+    parser.add_argument('--containers', type=int, default=0,
+                        help="quantidade de containers [0, 1] no formato 'quantidades'")
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--modo-construcao', choices=['first_fit', 'best_fit'], default='first_fit')
+    parser.add_argument('--modo-busca', choices=['primeira_melhora', 'prioridade', 'tabu', 'exato'],
+                        default='primeira_melhora')
+    parser.add_argument('--sem-fase-lucro', action='store_true')
+    parser.add_argument('--sem-reparo-minimos', action='store_true')
+    parser.add_argument('--processos', type=int, default=os.cpu_count())
+    parser.add_argument('--intervalo-checkpoint', type=float, default=None,
+                        help="grava o progresso em <arquivo>.checkpoint.npz a cada tantos segundos")
+    parser.add_argument('--retomar', action='store_true',
+                        help="continua de <arquivo>.checkpoint.npz quando ele existir")
+    parser.add_argument('--saida', default='resultados.jsonl',
+                        help="arquivo JSONL de saída ('-' para a saída padrão)")
+    args = parser.parse_args(argv)
+
+    if args.formato == 'quantidades' and args.containers <= 0:
+        parser.error("--containers é obrigatório no formato 'quantidades'")
+    if args.retomar and not args.intervalo_checkpoint:
+        parser.error("--retomar exige --intervalo-checkpoint")
+
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8')
+    falhas = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.processos) as executor:
+            futuros = {
+                executor.submit(resolver_arquivo, caminho, args.tempo_limite, args.formato,
+                                args.containers, args.semente, args.modo_construcao,
+                                args.modo_busca, not args.sem_fase_lucro,
+                                args.intervalo_checkpoint, args.retomar,
+                                not args.sem_reparo_minimos): caminho
+                for caminho in args.arquivos
+            }
+            for futuro in as_completed(futuros):
+                try:
+                    registro = futuro.result()
+                except Exception as e:
+                    falhas += 1
+                    registro = {'arquivo': futuros[futuro], 'erro': f"{type(e).__name__}: {e}"}
+                saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+                saida.flush()
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import math
+import time
+import random as rd
+
+
+def recozimento_simulado(instancia, solucao, tempo_limite, semente=None,
+                         temperatura_inicial=None, temperatura_final=None):
+    # Segunda fase: maximiza o lucro a partir do X da busca local, com
+    # movimentos de inserir, remover, trocar (atribuído <-> não atribuído) e
+    # transferir pedidos. Cada movimento é avaliado em O(1) pelas cargas por
+    # container e pelo lucro corrente; nenhum movimento pode afastar um
+    # container do seu intervalo [min, max], então as violações não aumentam.
+    aleatorio = rd.Random(semente)
+    n, k = instancia.n, instancia.k
+    quant = instancia.quantidades
+    lucro = instancia.lucros
+    lim_inf = instancia.limites_inferiores
+    lim_sup = instancia.limites_superiores
+    X = solucao.X
+    carga = solucao.cargas
+
+    atribuidos = []
+    livres = []
+    posicao = [0] * n
+    lucro_atual = 0
+    for i in range(n):
+        if X[i] != -1:
+            lucro_atual += lucro[i]
+            posicao[i] = len(atribuidos)
+            atribuidos.append(i)
+        else:
+            posicao[i] = len(livres)
+            livres.append(i)
+
+    if n == 0 or k == 0:
+        return
+
+    # As cargas são atualizadas incrementalmente e o recozimento tende a
+    # encostar os containers nos limites; a margem evita que o erro de
+    # arredondamento acumulado vire uma violação quando a carga é somada
+    # de novo do zero.
+    margem = 1e-9
+
+    def distancia(v, c):
+        return max(lim_inf[v] + margem - c, c - lim_sup[v] + margem, 0)
+
+    def permitido(v, nova_carga):
+        return distancia(v, nova_carga) <= distancia(v, carga[v])
+
+    def tirar(lista, i):
+        ultimo = lista.pop()
+        if ultimo != i:
+            lista[posicao[i]] = ultimo
+            posicao[ultimo] = posicao[i]
+
+    def mover(i, destino):
+        nonlocal lucro_atual
+        origem = X[i]
+        if origem == -1:
+            tirar(livres, i)
+            posicao[i] = len(atribuidos)
+            atribuidos.append(i)
+            lucro_atual += lucro[i]
+        else:
+            carga[origem] -= quant[i]
+        if destino == -1:
+            tirar(atribuidos, i)
+            posicao[i] = len(livres)
+            livres.append(i)
+            lucro_atual -= lucro[i]
+        else:
+            carga[destino] += quant[i]
+        X[i] = destino
+        return origem
+
+    if temperatura_inicial is None:
+        temperatura_inicial = max(sum(lucro) / n, 1e-9)
+    if temperatura_final is None:
+        temperatura_final = temperatura_inicial * 1e-3
+    temperatura = temperatura_inicial
+
+    # Movimentos aplicados desde o melhor lucro visto; desfazê-los volta ao
+    # melhor X sem precisar copiá-lo a cada melhora.
+    historico = []
+    limite_historico = max(n, 10000)
+    melhor_lucro = lucro_atual
+
+    def voltar_ao_melhor():
+        while historico:
+            i, origem = historico.pop()
+            mover(i, origem)
+
+    inicio_tempo = time.time()
+    iteracao = 0
+    while True:
+        iteracao += 1
+        if iteracao % 256 == 0:
+            decorrido = time.time() - inicio_tempo
+            if decorrido >= tempo_limite:
+                break
+            fracao = decorrido / tempo_limite
+            temperatura = temperatura_inicial * (temperatura_final / temperatura_inicial) ** fracao
+
+        movimento = aleatorio.randrange(4)
+        if movimento == 0:
+            if not livres:
+                continue
+            i = livres[aleatorio.randrange(len(livres))]
+            v = aleatorio.randrange(k)
+            if not permitido(v, carga[v] + quant[i]):
+                continue
+            delta = lucro[i]
+            trocas = [(i, v)]
+        else:
+            if not atribuidos:
+                continue
+            i = atribuidos[aleatorio.randrange(len(atribuidos))]
+            v = X[i]
+            if movimento == 1:
+                if not permitido(v, carga[v] - quant[i]):
+                    continue
+                delta = -lucro[i]
+                trocas = [(i, -1)]
+            elif movimento == 2:
+                if not livres:
+                    continue
+                j = livres[aleatorio.randrange(len(livres))]
+                if not permitido(v, carga[v] - quant[i] + quant[j]):
+                    continue
+                delta = lucro[j] - lucro[i]
+                trocas = [(i, -1), (j, v)]
+            else:
+                destino = aleatorio.randrange(k)
+                if destino == v or not permitido(v, carga[v] - quant[i]) or \
+                   not permitido(destino, carga[destino] + quant[i]):
+                    continue
+                delta = 0
+                trocas = [(i, destino)]
+
+        if delta < 0 and aleatorio.random() >= math.exp(delta / temperatura):
+            continue
+
+        for pedido, destino in trocas:
+            historico.append((pedido, mover(pedido, destino)))
+        if lucro_atual > melhor_lucro:
+            melhor_lucro = lucro_atual
+            historico.clear()
+        elif len(historico) > limite_historico:
+            voltar_ao_melhor()
+
+    voltar_ao_melhor()
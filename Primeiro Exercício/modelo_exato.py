@@ -0,0 +1,131 @@
+import os
+import re
+import tempfile
+import time
+
+import pulp
+
+from instancia import Solucao
+
+
+def resolver_exato(instancia, tempo_limite, solucao_inicial=None, mensagens=False):
+    # Modelo inteiro do problema completo, resolvido pelo CBC do pulp:
+    # x[i, v] = 1 se o pedido i vai para o container v (só os pares em que o
+    # pedido cabe no máximo do container) e z[v] = 1 se o container v fica
+    # abaixo do mínimo. A carga nunca passa do máximo; o mínimo só vale com
+    # z[v] = 0. O objetivo é o mesmo critério do resolver: primeiro menos
+    # violações (peso maior que o lucro total), depois mais lucro.
+    # solucao_inicial é passada ao CBC como ponto de partida. Devolve a
+    # melhor Solucao entre a do CBC e solucao_inicial e o melhor limitante
+    # do objetivo relatado pelo CBC (None se não houver; ver gap), ou
+    # (None, None) se o modelo não couber em
+    # tempo_limite ou o CBC não achar solução, para o chamador seguir outro
+    # caminho.
+    inicio = time.time()
+    n, k = instancia.n, instancia.k
+    quant = instancia.quantidades
+    lucro = instancia.lucros
+    lim_inf = instancia.limites_inferiores
+    lim_sup = instancia.limites_superiores
+
+    # Minimiza o negativo do lucro: com LpMaximize o CBC lê o ponto de
+    # partida com o sinal trocado e o descarta.
+    prob = pulp.LpProblem("Alocacao_Pedidos", pulp.LpMinimize)
+    x = {}
+    por_pedido = [[] for _ in range(n)]
+    por_container = [[] for _ in range(k)]
+    for v in range(k):
+        for i in range(n):
+            if quant[i] <= lim_sup[v]:
+                variavel = pulp.LpVariable(f"x_{i}_{v}", cat='Binary')
+                x[i, v] = variavel
+                por_pedido[i].append(variavel)
+                por_container[v].append((variavel, quant[i]))
+        # Gravar o modelo para o CBC e ler a solução de volta custam mais ou
+        # menos o dobro da montagem; se a montagem projetada pelos
+        # containers já feitos não deixa tempo para isso, desiste logo.
+        if 3 * (time.time() - inicio) * k / (v + 1) > tempo_limite:
+            print("O modelo exato não cabe no tempo limite.")
+            return None, None
+    z = [pulp.LpVariable(f"z_{v}", cat='Binary') for v in range(k)]
+
+    peso_violacao = _peso_violacao(instancia)
+    prob += pulp.LpAffineExpression(
+        [(x[chave], -lucro[chave[0]]) for chave in x] + [(z[v], peso_violacao) for v in range(k)]
+    ), "Violacoes_Menos_Lucro"
+    for i in range(n):
+        if len(por_pedido[i]) > 1:
+            prob += pulp.lpSum(por_pedido[i]) <= 1, f"Pedido_{i}"
+    for v in range(k):
+        carga = pulp.LpAffineExpression(por_container[v])
+        prob += carga <= lim_sup[v], f"Maximo_{v}"
+        prob += carga + lim_inf[v] * z[v] >= lim_inf[v], f"Minimo_{v}"
+
+    if solucao_inicial is not None:
+        X = solucao_inicial.X
+        for (i, v), variavel in x.items():
+            variavel.setInitialValue(1 if X[i] == v else 0)
+        for v in range(k):
+            z[v].setInitialValue(0 if solucao_inicial.cargas[v] >= lim_inf[v] else 1)
+
+    # O tempo de gravar e ler o modelo sai do limite dado ao CBC.
+    montagem = time.time() - inicio
+    restante = tempo_limite - 3 * montagem
+    if restante <= 0:
+        print("O modelo exato não cabe no tempo limite.")
+        return None, None
+
+    # O gap só aparece no log do CBC, então o log vai para um arquivo.
+    descritor, log = tempfile.mkstemp(suffix='.log')
+    os.close(descritor)
+    try:
+        solver = pulp.PULP_CBC_CMD(msg=mensagens, timeLimit=restante,
+                                   warmStart=solucao_inicial is not None, logPath=log)
+        prob.solve(solver)
+        with open(log, 'r', errors='replace') as f:
+            texto = f.read()
+    finally:
+        os.remove(log)
+
+    if prob.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        print("O modelo exato não encontrou solução:", pulp.LpStatus[prob.status])
+        return None, None
+
+    X = [-1] * n
+    for (i, v), variavel in x.items():
+        if variavel.varValue is not None and variavel.varValue > 0.5:
+            X[i] = v
+    solucao = Solucao(instancia, X)
+    # Se o CBC descartou o ponto de partida (por exemplo, um X acima do
+    # máximo vindo da busca tabu), ele pode terminar pior que ele.
+    if solucao_inicial is not None and \
+       (solucao.violacoes(), -solucao.lucro()) > (solucao_inicial.violacoes(), -solucao_inicial.lucro()):
+        solucao = solucao_inicial
+    # Com o ótimo provado, o limitante é o próprio ótimo.
+    if prob.sol_status == pulp.LpSolutionOptimal:
+        return solucao, pulp.value(prob.objective)
+    return solucao, _limitante(texto)
+
+
+def objetivo(solucao):
+    # Valor de uma Solucao no objetivo do modelo: violações com peso maior
+    # que o lucro total, menos o lucro.
+    return _peso_violacao(solucao.instancia) * solucao.violacoes() - solucao.lucro()
+
+
+def gap(solucao, limitante):
+    # Gap de otimalidade de qualquer Solucao (a da heurística ou a do CBC)
+    # em relação ao limitante devolvido por resolver_exato.
+    valor = objetivo(solucao)
+    return abs(valor - limitante) / max(abs(valor), 1e-9)
+
+
+def _peso_violacao(instancia):
+    return sum(instancia.lucros) + 1
+
+
+def _limitante(log):
+    # Melhor limitante ("best possible") que o CBC relata ao parar pelo
+    # tempo, ou None se o log não trouxer.
+    encontrado = re.findall(r'best possible ([-\d.eE+]+)', log)
+    return float(encontrado[-1]) if encontrado else None
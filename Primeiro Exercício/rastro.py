@@ -0,0 +1,94 @@
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Rastro:
+    # Métricas da busca_local: iterações, trocas aplicadas e sem troca
+    # possível, tempo gasto escolhendo o par de containers e escolhendo os
+    # pedidos, a contagem de violações ao longo do tempo (uma amostra a cada
+    # `intervalo` segundos) e o pico de memória do processo. Com `arquivo`,
+    # cada amostra e o resumo final viram uma linha JSONL.
+    def __init__(self, arquivo=None, intervalo=1.0):
+        self.arquivo = arquivo
+        self.intervalo = intervalo
+        self.iteracoes = 0
+        self.trocas_aplicadas = 0
+        self.trocas_falhas = 0
+        self.tempo_escolha_container = 0.0
+        self.tempo_escolha_pedidos = 0.0
+        self._tempo_escolha = 0.0
+        self.tempo_total = 0.0
+        self.pico_memoria_kb = None
+        self.amostras = []
+        self._saida = None
+
+    def iniciar(self, violacoes):
+        # Uma segunda busca com o mesmo Rastro (o modo exato que volta para
+        # a busca normal) continua a mesma série e o mesmo arquivo.
+        agora = time.time()
+        if not self.amostras:
+            self._inicio = agora
+        self._proxima_amostra = agora + self.intervalo
+        if self.arquivo is not None:
+            self._saida = open(self.arquivo, 'a' if self.amostras else 'w', encoding='utf-8')
+        self._amostrar(agora, violacoes)
+
+    def registrar(self, aplicada, violacoes, agora, tempo_escolha):
+        self.iteracoes += 1
+        self._tempo_escolha += tempo_escolha
+        if aplicada:
+            self.trocas_aplicadas += 1
+        else:
+            self.trocas_falhas += 1
+        if agora >= self._proxima_amostra:
+            self._amostrar(agora, violacoes)
+            self._proxima_amostra = agora + self.intervalo
+
+    def finalizar(self, violacoes):
+        agora = time.time()
+        self._amostrar(agora, violacoes)
+        self.tempo_total = agora - self._inicio
+        # Os pedidos são escolhidos dentro da escolha do movimento, então o
+        # tempo do par de containers é o total da escolha menos o dos pedidos.
+        self.tempo_escolha_container = max(self._tempo_escolha - self.tempo_escolha_pedidos, 0.0)
+        if resource is not None:
+            pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.pico_memoria_kb = pico // 1024 if sys.platform == 'darwin' else pico
+        if self._saida is not None:
+            self._escrever({'tipo': 'resumo', **self.resumo()})
+            self._saida.close()
+            self._saida = None
+
+    @property
+    def iteracoes_por_segundo(self):
+        return self.iteracoes / self.tempo_total if self.tempo_total > 0 else 0.0
+
+    def resumo(self):
+        return {
+            'iteracoes': self.iteracoes,
+            'iteracoes_por_segundo': self.iteracoes_por_segundo,
+            'trocas_aplicadas': self.trocas_aplicadas,
+            'trocas_falhas': self.trocas_falhas,
+            'tempo_escolha_container': self.tempo_escolha_container,
+            'tempo_escolha_pedidos': self.tempo_escolha_pedidos,
+            'tempo_total': self.tempo_total,
+            'violacoes_finais': self.amostras[-1][2] if self.amostras else None,
+            'pico_memoria_kb': self.pico_memoria_kb,
+        }
+
+    def _amostrar(self, agora, violacoes):
+        amostra = (agora - self._inicio, self.iteracoes, violacoes)
+        self.amostras.append(amostra)
+        if self._saida is not None:
+            self._escrever({'tipo': 'amostra', 'tempo': amostra[0],
+                            'iteracoes': amostra[1], 'violacoes': amostra[2]})
+
+    def _escrever(self, registro):
+        self._saida.write(json.dumps(registro) + '\n')
+        self._saida.flush()
@@ -0,0 +1,155 @@
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+
+# Pedidos não atendidos considerados por container (os maiores que cabem)
+MAX_CANDIDATOS = 128
+# Containers doadores (os de maior folga acima do mínimo) e pedidos
+# oferecidos por cada um
+MAX_DOADORES = 16
+OFERTAS_POR_DOADOR = 8
+# Resolução do subset-sum: a folga até o máximo vira tantas unidades
+UNIDADES = 4096
+# Somas alcançáveis testadas com a aritmética exata antes de desistir
+TENTATIVAS = 4
+
+
+def preencher_minimos(instancia, solucao, tempo_limite=None):
+    # Reparo entre a construção e a busca local: para cada container abaixo
+    # do mínimo, resolve um subset-sum limitado sobre os maiores pedidos não
+    # atendidos que cabem e sobre pedidos que containers com folga podem
+    # ceder sem cair abaixo do próprio mínimo, e move de uma vez o
+    # subconjunto que leva a carga para [mínimo, máximo]. As quantidades são
+    # arredondadas para o DP (bitset em um inteiro do Python) e o conjunto
+    # escolhido é conferido com a soma exata. Devolve quantos containers
+    # foram corrigidos.
+    inicio_tempo = time.time()
+    n, k = instancia.n, instancia.k
+    quant = instancia.quantidades
+    lim_inf = instancia.limites_inferiores
+    lim_sup = instancia.limites_superiores
+    X = solucao.X
+    carga = solucao.cargas
+
+    abaixo_minimo = [v for v in range(k) if carga[v] < lim_inf[v]]
+    if not abaixo_minimo:
+        return 0
+
+    livres = sorted((quant[i], i) for i in range(n) if X[i] == -1)
+    membros = [[] for _ in range(k)]
+    for i in range(n):
+        if X[i] != -1:
+            membros[X[i]].append(i)
+
+    # Folga acima do mínimo de cada container válido, em lista ordenada.
+    folgas = []
+    chave_folga = [None] * k
+
+    def atualizar_folga(w):
+        if chave_folga[w] is not None:
+            del folgas[bisect_left(folgas, chave_folga[w])]
+            chave_folga[w] = None
+        if lim_inf[w] < carga[w] <= lim_sup[w]:
+            chave_folga[w] = (carga[w] - lim_inf[w], w)
+            insort(folgas, chave_folga[w])
+
+    for w in range(k):
+        if lim_inf[w] < carga[w] <= lim_sup[w]:
+            chave_folga[w] = (carga[w] - lim_inf[w], w)
+            folgas.append(chave_folga[w])
+    folgas.sort()
+
+    def candidatos(v, sobra):
+        fim = bisect_right(livres, (sobra, n))
+        lista = [(q, i, -1) for q, i in reversed(livres[max(fim - MAX_CANDIDATOS, 0):fim])]
+        for folga, w in reversed(folgas[-MAX_DOADORES:]):
+            oferecido = 0.0
+            ofertas = 0
+            for i in sorted(membros[w], key=quant.__getitem__, reverse=True):
+                if ofertas == OFERTAS_POR_DOADOR:
+                    break
+                if quant[i] <= sobra and oferecido + quant[i] <= folga:
+                    oferecido += quant[i]
+                    ofertas += 1
+                    lista.append((quant[i], i, w))
+        return lista
+
+    def aceitavel(v, escolhidos):
+        # Refaz as somas na ordem em que os movimentos serão aplicados.
+        nova = carga[v]
+        retiradas = {}
+        for q, i, w in escolhidos:
+            nova += q
+            if w != -1:
+                retiradas[w] = retiradas.get(w, carga[w]) - q
+        return lim_inf[v] <= nova <= lim_sup[v] and \
+            all(lim_inf[w] <= c <= lim_sup[w] for w, c in retiradas.items())
+
+    corrigidos = 0
+    for v in abaixo_minimo:
+        if tempo_limite is not None and time.time() - inicio_tempo >= tempo_limite:
+            break
+        falta, sobra = lim_inf[v] - carga[v], lim_sup[v] - carga[v]
+        lista = candidatos(v, sobra)
+        if not lista:
+            continue
+        unidade = sobra / UNIDADES
+        pesos = [max(round(q / unidade), 1) for q, _, _ in lista]
+        escolha = None
+        for posicoes in _subconjuntos(pesos, math.ceil(falta / unidade), UNIDADES):
+            escolhidos = [lista[p] for p in posicoes]
+            if aceitavel(v, escolhidos):
+                escolha = escolhidos
+                break
+        if escolha is None:
+            continue
+
+        for q, i, w in escolha:
+            if w == -1:
+                del livres[bisect_left(livres, (q, i))]
+            else:
+                membros[w].remove(i)
+                carga[w] -= q
+                atualizar_folga(w)
+            X[i] = v
+            carga[v] += q
+            membros[v].append(i)
+        atualizar_folga(v)
+        corrigidos += 1
+    return corrigidos
+
+
+def _subconjuntos(pesos, minimo, maximo):
+    # Subconjuntos (posições em pesos) com soma inteira em [minimo, maximo],
+    # até TENTATIVAS deles, começando pelas somas mais próximas do meio do
+    # intervalo, onde o arredondamento tem mais margem.
+    if minimo > maximo:
+        return
+    mascara = (1 << (maximo + 1)) - 1
+    alcance = [1]
+    for p in pesos:
+        alcance.append((alcance[-1] | (alcance[-1] << p)) & mascara)
+    final = alcance[-1]
+    meio = (minimo + maximo) // 2
+    acima = final >> meio << meio
+    abaixo = final & (((1 << meio) - 1) >> minimo << minimo)
+    for _ in range(TENTATIVAS):
+        if not acima and not abaixo:
+            return
+        # Soma alcançável mais próxima do meio, por cima ou por baixo.
+        soma_acima = (acima & -acima).bit_length() - 1 if acima else None
+        soma_abaixo = abaixo.bit_length() - 1 if abaixo else None
+        if soma_abaixo is None or (soma_acima is not None and soma_acima - meio <= meio - soma_abaixo):
+            soma = soma_acima
+            acima ^= 1 << soma
+        else:
+            soma = soma_abaixo
+            abaixo ^= 1 << soma
+        # Volta pelos prefixos: se a soma já era alcançável sem o item t, ele
+        # fica de fora, o que favorece os primeiros itens (não atendidos).
+        posicoes = []
+        for t in range(len(pesos), 0, -1):
+            if not alcance[t - 1] >> soma & 1:
+                posicoes.append(t - 1)
+                soma -= pesos[t - 1]
+        yield posicoes
@@ -0,0 +1,182 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from busca_local import busca_local
+from busca_tabu import busca_tabu
+from checkpoint import Checkpoint
+from construcao import guloso_best_fit, guloso_first_fit
+from instancia import Instancia, Solucao
+from melhoria import recozimento_simulado
+from reparo import preencher_minimos
+
+# Com modo_busca='exato', fração do tempo dada à heurística (busca local e
+# fase de lucro) antes do modelo
+FRACAO_HEURISTICA_EXATO = 0.5
+
+
+def resolver(instancia, tempo_limite, semente=None, modo_construcao='first_fit',
+             modo_busca='primeira_melhora', fase_lucro=True, partidas=1, processos=None,
+             checkpoint=None, intervalo_checkpoint=60.0, retomar=False, rastro=None,
+             reparo_minimos=True):
+    # Ponto de entrada da biblioteca, para as duas variantes (com lucro ou só
+    # com quantidades, conforme a Instancia): constrói a solução inicial,
+    # corrige as violações (com reparo_minimos, primeiro completando de uma
+    # vez os containers abaixo do mínimo) e, com fase_lucro, usa o tempo que
+    # sobrar para aumentar o lucro. Com partidas > 1 roda partidas
+    # independentes em processos e devolve a melhor. Tudo dentro de
+    # tempo_limite segundos.
+    # Com checkpoint (caminho de um .npz), o estado é gravado a cada
+    # intervalo_checkpoint segundos da busca_local e ao fim de cada fase; com
+    # retomar, a execução continua da última gravação, se houver. Um Rastro
+    # em rastro recebe as métricas da busca_local.
+    if partidas > 1:
+        if checkpoint is not None or rastro is not None:
+            raise ValueError("checkpoint e rastro só são suportados com partidas=1")
+        return busca_multipartida(instancia, tempo_limite, partidas=partidas,
+                                  modo_construcao=modo_construcao, modo_busca=modo_busca,
+                                  processos=processos, fase_lucro=fase_lucro,
+                                  semente=semente or 0, reparo_minimos=reparo_minimos)
+    controle = None
+    if checkpoint is not None:
+        controle = Checkpoint(checkpoint, intervalo_checkpoint)
+        if retomar:
+            controle.carregar(instancia)
+    return _resolver_partida(instancia, time.time() + tempo_limite, semente,
+                             modo_construcao, modo_busca, fase_lucro, checkpoint=controle,
+                             rastro=rastro, reparo_minimos=reparo_minimos)
+
+
+def construir(instancia, modo_construcao='first_fit', ordem_containers=None, reparo_minimos=True,
+              prazo=None):
+    # Solução inicial pelo guloso escolhido ('first_fit' ou 'best_fit') e,
+    # com reparo_minimos, os containers abaixo do mínimo completados por
+    # preencher_minimos até o prazo (time.time()), se houver.
+    quantidades = instancia.como_numpy('quantidades')
+    limites_inferiores = instancia.como_numpy('limites_inferiores')
+    limites_superiores = instancia.como_numpy('limites_superiores')
+    if modo_construcao == 'best_fit':
+        X = guloso_best_fit(quantidades, limites_inferiores, limites_superiores)
+    else:
+        X = guloso_first_fit(quantidades, limites_inferiores, limites_superiores, ordem_containers)
+    solucao = Solucao(instancia, X)
+    if reparo_minimos:
+        preencher_minimos(instancia, solucao,
+                          None if prazo is None else max(prazo - time.time(), 0))
+    return solucao
+
+
+def _resolver_partida(instancia, prazo, semente, modo_construcao, modo_busca, fase_lucro,
+                      ordem_containers=None, checkpoint=None, rastro=None, reparo_minimos=True):
+    if checkpoint is not None and checkpoint.solucao is not None:
+        solucao, fase = checkpoint.solucao, checkpoint.fase
+    else:
+        solucao = construir(instancia, modo_construcao, ordem_containers, reparo_minimos, prazo)
+        fase = 'busca'
+        if checkpoint is not None:
+            checkpoint.gravar(solucao, fase)
+
+    if modo_busca == 'exato' and fase == 'busca':
+        # A heurística (busca local e, com fase_lucro, a fase de lucro) usa
+        # a sua fração do tempo e dá o ponto de partida do modelo exato, que
+        # fica com o resto; vale a melhor das duas soluções. Se o modelo não
+        # couber no tempo, a partida segue o caminho normal com o que sobrou.
+        from modelo_exato import gap, resolver_exato
+        prazo_heuristica = time.time() + FRACAO_HEURISTICA_EXATO * max(prazo - time.time(), 0)
+        busca_local(instancia, solucao, max(prazo_heuristica - time.time(), 0), semente=semente,
+                    checkpoint=checkpoint, rastro=rastro)
+        if fase_lucro:
+            recozimento_simulado(instancia, solucao, max(prazo_heuristica - time.time(), 0),
+                                 semente=semente)
+        heuristica = solucao
+        exata, limitante = resolver_exato(instancia, max(prazo - time.time(), 0), solucao)
+        if exata is not None:
+            solucao, fase = exata, 'lucro'
+            if limitante is not None:
+                print(f"Gap de otimalidade da heurística: {gap(heuristica, limitante):.2%}")
+                print(f"Gap de otimalidade da solução final: {gap(solucao, limitante):.2%}")
+            if checkpoint is not None:
+                checkpoint.gravar(solucao, fase)
+            return solucao
+
+    if fase == 'busca':
+        # A busca tabu se afasta da melhor solução e só volta a ela no fim,
+        # então nela só há gravação ao fim da fase.
+        if modo_busca == 'tabu':
+            busca_tabu(instancia, solucao, max(prazo - time.time(), 0), semente=semente)
+        else:
+            estrategia = 'prioridade' if modo_busca == 'prioridade' else 'aleatoria'
+            busca_local(instancia, solucao, max(prazo - time.time(), 0), semente=semente,
+                        estrategia=estrategia, checkpoint=checkpoint, rastro=rastro)
+        # Se a busca parou pelo tempo, a retomada deve continuar nela.
+        fase = 'lucro' if time.time() < prazo else 'busca'
+        if checkpoint is not None and (fase == 'lucro' or modo_busca == 'tabu'):
+            checkpoint.gravar(solucao, fase)
+    if fase_lucro:
+        recozimento_simulado(instancia, solucao, max(prazo - time.time(), 0), semente=semente)
+        if checkpoint is not None and fase == 'lucro':
+            checkpoint.gravar(solucao, fase)
+    return solucao
+
+
+def busca_multipartida(instancia, tempo_limite, partidas=None,
+                       modo_construcao='first_fit', modo_busca='primeira_melhora',
+                       processos=None, fase_lucro=False, semente=0, reparo_minimos=True):
+    # Roda partidas independentes (construção + busca, cada uma com sua
+    # semente) em processos separados e devolve a melhor Solucao: menos
+    # violações e, no empate, maior lucro. Os arrays da instância vão para
+    # memória compartilhada uma única vez em vez de serem serializados para
+    # cada processo.
+    prazo = time.time() + tempo_limite
+    partidas = partidas or os.cpu_count()
+    processos = min(processos or os.cpu_count(), partidas)
+
+    n, k = instancia.n, instancia.k
+    bloco = shared_memory.SharedMemory(create=True, size=max(8 * (2 * n + 2 * k), 1))
+    try:
+        dados = np.ndarray(2 * n + 2 * k, dtype=np.float64, buffer=bloco.buf)
+        dados[:n] = instancia.como_numpy('quantidades')
+        dados[n:2 * n] = instancia.como_numpy('lucros')
+        dados[2 * n:2 * n + k] = instancia.como_numpy('limites_inferiores')
+        dados[2 * n + k:] = instancia.como_numpy('limites_superiores')
+        del dados
+        descritor = (bloco.name, n, k)
+
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [
+                executor.submit(_executar_partida, semente + partida, partida == 0, descritor,
+                                modo_construcao, modo_busca, prazo, fase_lucro, reparo_minimos)
+                for partida in range(partidas)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+    finally:
+        bloco.close()
+        bloco.unlink()
+
+    violacoes, lucro, semente, X = min(resultados, key=lambda r: (r[0], -r[1], r[2]))
+    return Solucao(instancia, X)
+
+
+def _ler_compartilhado(nome, n, k):
+    bloco = shared_memory.SharedMemory(name=nome)
+    try:
+        dados = np.ndarray(2 * n + 2 * k, dtype=np.float64, buffer=bloco.buf)
+        instancia = Instancia(dados[:n], dados[n:2 * n], dados[2 * n:2 * n + k], dados[2 * n + k:])
+        del dados
+        return instancia
+    finally:
+        bloco.close()
+
+
+def _executar_partida(semente, primeira, descritor, modo_construcao, modo_busca, prazo, fase_lucro,
+                      reparo_minimos):
+    instancia = _ler_compartilhado(*descritor)
+    # A primeira partida usa a ordem original; as demais sorteiam a ordem
+    # dos containers do first-fit para diversificar a solução inicial.
+    ordem = None if primeira else np.random.default_rng(semente).permutation(instancia.k)
+    solucao = _resolver_partida(instancia, prazo, semente, modo_construcao, modo_busca,
+                                fase_lucro, ordem, reparo_minimos=reparo_minimos)
+    return solucao.violacoes(), solucao.lucro(), semente, solucao.X
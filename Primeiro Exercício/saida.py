@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+
+# Containers formatados por vez antes de cada escrita no arquivo
+CONTAINERS_POR_BLOCO = 4096
+LINHAS_POR_BLOCO = 1 << 16
+# Extensão do arquivo de cada formato de gravar_compacto
+EXTENSOES_COMPACTAS = {'csv': '.csv', 'binario': '.npy'}
+
+
+def _agrupar(solucao):
+    # Pedidos atendidos agrupados por container (em ordem de índice dentro
+    # de cada um) e onde termina o grupo de cada container.
+    X = np.frombuffer(solucao.X, dtype=np.int64)
+    atribuidos = np.flatnonzero(X != -1)
+    ordem = atribuidos[np.argsort(X[atribuidos], kind='stable')]
+    fins = np.cumsum(np.bincount(X[atribuidos], minlength=solucao.instancia.k))
+    return ordem.tolist(), fins.tolist()
+
+
+def gravar_alocacao(caminho, solucao):
+    # Mesmo texto de sempre ("Container v:" seguido de "  Pedido i" ou de
+    # "  Nenhum pedido alocado"), montado em blocos de containers.
+    pedidos, fins = _agrupar(solucao)
+    partes = []
+    inicio = 0
+    with open(caminho, 'w') as f:
+        for v, fim in enumerate(fins):
+            if fim > inicio:
+                partes.append(f"Container {v}:\n" +
+                              ("  Pedido %d\n" * (fim - inicio)) % tuple(pedidos[inicio:fim]) + "\n")
+            else:
+                partes.append(f"Container {v}:\n  Nenhum pedido alocado\n\n")
+            inicio = fim
+            if len(partes) == CONTAINERS_POR_BLOCO:
+                f.write(''.join(partes))
+                partes.clear()
+        f.write(''.join(partes))
+
+
+def gravar_compacto(caminho, solucao, formato='csv'):
+    # 'csv': uma linha "pedido,container" por pedido atendido; 'binario':
+    # o X inteiro (-1 = não atendido) em um .npy, lido com np.load.
+    if formato not in EXTENSOES_COMPACTAS:
+        raise ValueError(f"Formato de saída compacta desconhecido: {formato!r} "
+                         f"(use {' ou '.join(map(repr, EXTENSOES_COMPACTAS))})")
+    X = np.frombuffer(solucao.X, dtype=np.int64)
+    if formato == 'binario':
+        np.save(caminho, X)
+        return
+    atribuidos = np.flatnonzero(X != -1)
+    pares = np.column_stack((atribuidos, X[atribuidos]))
+    with open(caminho, 'w') as f:
+        f.write("pedido,container\n")
+        for inicio in range(0, len(pares), LINHAS_POR_BLOCO):
+            bloco = pares[inicio:inicio + LINHAS_POR_BLOCO]
+            f.write(("%d,%d\n" * len(bloco)) % tuple(bloco.ravel().tolist()))
+
+
+def resumo(solucao):
+    # Métricas da solução, calculadas sobre os arrays de uma vez.
+    instancia = solucao.instancia
+    X = np.frombuffer(solucao.X, dtype=np.int64)
+    atendidos = X != -1
+    return {
+        'pedidos': instancia.n,
+        'containers': instancia.k,
+        'pedidos_atendidos': int(np.count_nonzero(atendidos)),
+        'lucro_total': float(instancia.como_numpy('lucros')[atendidos].sum()),
+        'carga_total': float(np.frombuffer(solucao.cargas, dtype=np.float64).sum()),
+        'violacoes': solucao.violacoes(),
+        'containers_utilizados': int(np.count_nonzero(np.bincount(X[atendidos],
+                                                                  minlength=instancia.k))),
+    }
+
+
+def gravar_resumo(caminho, metricas):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(metricas, f, ensure_ascii=False, indent=2)
+        f.write('\n')
@@ -1,21 +1,16 @@
-import json
-import math
 import networkx as nx
 import os
 import time
 
+from city_data import load_cities
+from graph_cache import cached_pairs
+
 JSON_FILE = 'Segundo Exercício\cities.json'
 DISTANCE_THRESHOLD = 3.5
+# 'grid' (índice espacial) ou 'dense' (matriz de distâncias em blocos)
+PAIR_METHOD = 'grid'
 TOLERANCE = 1e-9
 
-def euclidean_distance(lat1, lon1, lat2, lon2):
-    try:
-        lat1_f, lon1_f, lat2_f, lon2_f = map(float, [lat1, lon1, lat2, lon2])
-        dist = math.sqrt((lat1_f - lat2_f)**2 + (lon1_f - lon2_f)**2)
-        return dist
-    except (ValueError, TypeError):
-        return float('inf')
-
 start_time = time.time()
 print("--- Problema da Clique Máxima (usando cities.json) ---")
 
@@ -25,53 +20,30 @@ if not os.path.exists(JSON_FILE):
     exit()
 
 try:
-    with open(JSON_FILE, 'r', encoding='utf-8') as f:
-        all_cities_data = json.load(f)
+    cities = load_cities(JSON_FILE)
 except Exception as e:
     print(f"Erro ao ler ou decodificar o arquivo JSON '{JSON_FILE}': {e}")
     exit()
 
-cities_data = {}
-for city_info in all_cities_data:
-    city_name = city_info.get('city', 'Unknown').strip()
-    if not city_name or city_name == 'Unknown': continue
-    try:
-        lat = float(city_info['latitude'])
-        lon = float(city_info['longitude'])
-        cities_data[city_name] = {'lat': lat, 'lon': lon}
-    except (ValueError, TypeError, KeyError):
-        continue
-
-if not cities_data:
+if not len(cities):
     print("Erro: Nenhuma cidade válida com coordenadas encontrada no arquivo.")
     exit()
-print(f"   Encontradas {len(cities_data)} cidades válidas.")
+print(f"   Encontradas {len(cities)} cidades válidas.")
 print(f"   Tempo de leitura: {time.time() - start_time:.2f}s")
 
 G = nx.Graph()
 print(f"\n2. Construindo grafo (arestas se dist <= {DISTANCE_THRESHOLD})...")
 build_start_time = time.time()
 
-G.add_nodes_from(cities_data.keys())
+G.add_nodes_from(cities.names)
 
 edges_added = 0
 nodes_in_graph = list(G.nodes())
 
-for i in range(len(nodes_in_graph)):
-    city1_name = nodes_in_graph[i]
-    city1_data = cities_data[city1_name]
-    lat1, lon1 = city1_data['lat'], city1_data['lon']
-
-    for j in range(i + 1, len(nodes_in_graph)):
-        city2_name = nodes_in_graph[j]
-        city2_data = cities_data[city2_name]
-        lat2, lon2 = city2_data['lat'], city2_data['lon']
-
-        distance = euclidean_distance(lat1, lon1, lat2, lon2)
-
-        if distance <= DISTANCE_THRESHOLD + TOLERANCE:
-            G.add_edge(city1_name, city2_name)
-            edges_added += 1
+pairs_i, pairs_j, _ = cached_pairs(cities, DISTANCE_THRESHOLD + TOLERANCE, PAIR_METHOD)
+for i, j in zip(pairs_i.tolist(), pairs_j.tolist()):
+    G.add_edge(nodes_in_graph[i], nodes_in_graph[j])
+    edges_added += 1
 
 print(f"   Grafo construído com {G.number_of_nodes()} nós e {G.number_of_edges()} arestas.")
 print(f"   Tempo de construção: {time.time() - build_start_time:.2f}s")
@@ -1,81 +1,55 @@
-import json
-import math
 import pulp
 import os
 import time
 
+from city_data import load_cities
+from graph_cache import cached_pairs
+
 
 JSON_FILE = 'Segundo Exercício\cities.json'
 DISTANCE_THRESHOLD = 2.5
 TOLERANCE = 1e-9
+# 'grid' (índice espacial) ou 'dense' (matriz de distâncias em blocos)
+PAIR_METHOD = 'grid'
 
 
-def euclidean_distance(lat1, lon1, lat2, lon2):
-    """
-    Calculates the simple Euclidean distance based on raw latitude and
-    longitude degrees. Returns float('inf') on error.
-    """
-    try:
-        lat1_f, lon1_f, lat2_f, lon2_f = map(float, [lat1, lon1, lat2, lon2])
-        dist = math.sqrt((lat1_f - lat2_f)**2 + (lon1_f - lon2_f)**2)
-        return dist
-    except (ValueError, TypeError):
-        return float('inf')
-
 start_time = time.time()
 if not os.path.exists(JSON_FILE):
     print(f"Erro: Arquivo '{JSON_FILE}' não encontrado.")
     exit()
 
+print("1. Identificando cidades válidas...")
 try:
-    with open(JSON_FILE, 'r', encoding='utf-8') as f:
-        all_cities_data = json.load(f)
+    cities = load_cities(JSON_FILE)
 except Exception as e:
     print(f"Erro ao ler ou decodificar o arquivo JSON '{JSON_FILE}': {e}")
     exit()
 
-cities_data = {}
-print("1. Identificando cidades válidas...")
-for city_info in all_cities_data:
-    city_name = city_info.get('city', 'Unknown').strip()
-    if not city_name or city_name == 'Unknown': continue
-    try:
-        lat = float(city_info['latitude'])
-        lon = float(city_info['longitude'])
-        cities_data[city_name] = {'lat': lat, 'lon': lon}
-    except (ValueError, TypeError, KeyError):
-        continue
-
-if not cities_data:
+if not len(cities):
     print("Erro: Nenhuma cidade válida com coordenadas encontrada no arquivo.")
     exit()
 
-potential_school_locations = list(cities_data.keys())
-cities_requiring_coverage = list(cities_data.keys())
+potential_school_locations = list(cities.names)
+cities_requiring_coverage = list(cities.names)
 
-print(f"   Encontradas {len(cities_data)} cidades válidas.")
+print(f"   Encontradas {len(cities)} cidades válidas.")
 print(f"   Tempo decorrido: {time.time() - start_time:.2f}s")
 
 coverage_map = {city_i: [] for city_i in cities_requiring_coverage}
 print(f"\n2. Calculando cobertura (dist <= {DISTANCE_THRESHOLD})...")
 calculation_start_time = time.time()
 
-num_calcs = 0
-for city_i_name in cities_requiring_coverage:
-    city_i_data = cities_data[city_i_name]
-    lat_i, lon_i = city_i_data['lat'], city_i_data['lon']
-
-    for city_j_name in potential_school_locations:
-        city_j_data = cities_data[city_j_name]
-        lat_j, lon_j = city_j_data['lat'], city_j_data['lon']
-
-        distance = euclidean_distance(lat_i, lon_i, lat_j, lon_j)
-        num_calcs += 1
-
-        if distance <= DISTANCE_THRESHOLD + TOLERANCE:
-            coverage_map[city_i_name].append(city_j_name)
-
-print(f"   Cálculos de distância realizados: {num_calcs}")
+# Cada cidade cobre a si mesma; os demais pares vêm do índice espacial, nos
+# dois sentidos, em ordem de índice como no laço sobre todos os pares.
+pairs_i, pairs_j, _ = cached_pairs(cities, DISTANCE_THRESHOLD + TOLERANCE, PAIR_METHOD)
+neighbors = [[index] for index in range(len(potential_school_locations))]
+for i, j in zip(pairs_i.tolist(), pairs_j.tolist()):
+    neighbors[i].append(j)
+    neighbors[j].append(i)
+for index, city_i_name in enumerate(potential_school_locations):
+    coverage_map[city_i_name] = [potential_school_locations[j] for j in sorted(neighbors[index])]
+
+print(f"   Pares de cidades dentro do raio: {len(pairs_i)}")
 print(f"   Tempo decorrido nesta etapa: {time.time() - calculation_start_time:.2f}s")
 
 
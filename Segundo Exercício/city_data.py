@@ -0,0 +1,121 @@
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Bumped whenever the cached layout or the parsing rules change
+CACHE_VERSION = 1
+HASH_BLOCK = 1 << 20
+
+
+class Cities:
+    """
+    Valid cities of a dataset as columns: names (list, in order of first
+    appearance), latitudes, longitudes and populations (arrays). A name
+    that appears more than once keeps its first position and the values
+    of its last record, like the dicts the scripts used to build. source
+    and digest identify the JSON file and its content, for caches derived
+    from the dataset.
+    """
+
+    def __init__(self, records, source=None, digest=None):
+        self.records = records
+        self.source = source
+        self.digest = digest
+        self.names = records['name'].tolist()
+        self.latitudes = records['latitude']
+        self.longitudes = records['longitude']
+        self.populations = records['population']
+
+    def __len__(self):
+        return len(self.records)
+
+    def index(self):
+        return {name: position for position, name in enumerate(self.names)}
+
+
+def load_cities(json_file, use_cache=True):
+    """
+    Loads the cities of json_file. The first load parses the JSON and
+    writes the columns to a .npy next to it, named after the file's hash;
+    later loads of the same content memory-map that file instead.
+    """
+    digest = file_digest(json_file)
+    if not use_cache:
+        return Cities(_parse(json_file), json_file, digest)
+
+    cache_file = f"{json_file}.v{CACHE_VERSION}.{digest}.npy"
+    if os.path.exists(cache_file):
+        try:
+            return Cities(np.load(cache_file, mmap_mode='r'), json_file, digest)
+        except (OSError, ValueError):
+            pass  # Truncated or foreign file: parsed again below.
+
+    records = _parse(json_file)
+    _write_cache(json_file, cache_file, records)
+    return Cities(records, json_file, digest)
+
+
+def file_digest(path):
+    """Short SHA-1 of the content of path."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _parse(json_file):
+    with open(json_file, 'r', encoding='utf-8') as f:
+        all_cities_data = json.load(f)
+
+    positions = {}
+    rows = []
+    for city_info in all_cities_data:
+        city_name = city_info.get('city', 'Unknown').strip()
+        if not city_name or city_name == 'Unknown':
+            continue
+        try:
+            row = (city_name, float(city_info['latitude']), float(city_info['longitude']),
+                   _parse_population(city_info))
+        except (ValueError, TypeError, KeyError):
+            continue
+        if city_name in positions:
+            rows[positions[city_name]] = row
+        else:
+            positions[city_name] = len(rows)
+            rows.append(row)
+
+    name_length = max((len(row[0]) for row in rows), default=1)
+    dtype = [('name', f'U{name_length}'), ('latitude', np.float64),
+             ('longitude', np.float64), ('population', np.int64)]
+    return np.array(rows, dtype=dtype)
+
+
+def _parse_population(city_info):
+    try:
+        return int(str(city_info.get('population', '0')).replace(',', ''))
+    except (ValueError, TypeError):
+        return 0
+
+
+def _write_cache(json_file, cache_file, records):
+    # Written to a temporary name and renamed, so an interrupted run never
+    # leaves a partial cache behind; caches of older contents are removed.
+    temporary = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, 'wb') as f:
+            np.save(f, records)
+        os.replace(temporary, cache_file)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        return
+    for old in glob.glob(glob.escape(json_file) + '.v*.npy'):
+        if old != cache_file:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
@@ -0,0 +1,244 @@
+import numpy as np
+
+
+class FlowNetwork:
+    """
+    Directed network on nodes 0..n-1 kept as a residual graph in CSR form:
+    the arcs leaving each node are contiguous, and every arc has a reverse
+    arc (capacity 0) that carries the flow back. Arcs can start inactive
+    and be activated later, in their input order; the flow already found
+    stays valid, so max_flow only has to push the extra flow the new arcs
+    allow. A max_flow with another (source, sink) pair starts again from
+    zero flow.
+    """
+
+    def __init__(self, n, tails, heads, capacities, active=True):
+        tails = np.asarray(tails, dtype=np.int64)
+        heads = np.asarray(heads, dtype=np.int64)
+        m = len(tails)
+        # Residual arcs 0..m-1 are the given ones and m..2m-1 their
+        # reverses, reordered by tail.
+        all_tails = np.concatenate((tails, heads))
+        order = np.argsort(all_tails, kind='stable')
+        position = np.empty(2 * m, dtype=np.int64)
+        position[order] = np.arange(2 * m)
+        partner = np.concatenate((np.arange(m, 2 * m), np.arange(m)))
+        # Node and arc ids in int32 when they fit, which halves the arrays.
+        index_type = np.int32 if max(n, 2 * m) < 2 ** 31 else np.int64
+
+        self.n = n
+        self.start = np.searchsorted(all_tails[order], np.arange(n + 1)).astype(index_type)
+        self.tail = all_tails[order].astype(index_type)
+        self.head = np.concatenate((heads, tails))[order].astype(index_type)
+        self.reverse = position[partner[order]].astype(index_type)
+        self.arc_position = position[:m].astype(index_type)
+        self.arc_tail = tails.astype(index_type)
+        self.arc_head = heads.astype(index_type)
+        self.capacity = np.asarray(capacities, dtype=np.int64)
+        self.residual = np.zeros(2 * m, dtype=np.int64)
+        self.active = 0
+        self.flow = 0
+        # (source, sink) of the flow in the residual graph, the nodes
+        # reachable from the source when the last max_flow ended (None if
+        # unknown), and the nodes that new arcs made reachable since then.
+        self._pair = None
+        self._reachable = None
+        self._frontier = []
+        if active:
+            self.activate(m)
+
+    def activate(self, end):
+        """Activates the arcs before position end of the input order."""
+        arcs = np.arange(self.active, end)
+        self.residual[self.arc_position[arcs]] += self.capacity[arcs]
+        if self._reachable is not None:
+            # An arc leaving the reachable set may open a new path.
+            opens = (self.capacity[arcs] > 0) & self._reachable[self.arc_tail[arcs]] & \
+                ~self._reachable[self.arc_head[arcs]]
+            self._frontier.append(self.arc_head[arcs[opens]])
+        self.active = max(self.active, end)
+
+    def max_flow(self, source, sink):
+        """
+        Maximum flow from source to sink by Dinic's algorithm, starting from
+        the flow already in the network. Returns the total value.
+        """
+        if source == sink:
+            raise ValueError("Source and sink must be different nodes")
+        if self._pair != (source, sink):
+            if self._pair is not None:
+                self.reset()
+            self._pair = (source, sink)
+        elif self._reachable is not None and not self._extend(sink):
+            return self.flow
+        while True:
+            distance = _bfs(self.start, self.head, self.residual > 0, [source], sink)
+            if distance[sink] < 0:
+                self._reachable, self._frontier = distance >= 0, []
+                return self.flow
+            self.flow += self._blocking_flow(source, sink, distance)
+
+    def reset(self):
+        """Removes all flow, keeping the active arcs."""
+        self.residual[:] = 0
+        self.residual[self.arc_position[:self.active]] = self.capacity[:self.active]
+        self.flow = 0
+        self._pair = None
+        self._reachable = None
+        self._frontier = []
+
+    def min_cut(self, source, sink):
+        """
+        Boolean array of the nodes on the source side of a minimum cut:
+        those still reachable from source once the flow is maximum.
+        """
+        self.max_flow(source, sink)
+        return self._reachable.copy()
+
+    def _extend(self, sink):
+        # Grows the stored reachable set from the frontier; True if it now
+        # reaches the sink (only then can there be an augmenting path).
+        if not self._frontier:
+            return False
+        frontier = np.unique(np.concatenate(self._frontier))
+        self._frontier = []
+        frontier = frontier[~self._reachable[frontier]]
+        if not len(frontier):
+            return False
+        distance = np.where(self._reachable, 0, -1)
+        distance[frontier] = 0
+        _bfs(self.start, self.head, self.residual > 0, frontier, sink, distance=distance)
+        self._reachable = distance >= 0
+        return bool(self._reachable[sink])
+
+    def _blocking_flow(self, source, sink, distance):
+        # Only the arcs on some shortest source-sink path matter in a
+        # phase: those whose tail is at distance d from the source and
+        # whose head is at distance L - d - 1 from the sink. The augmenting
+        # paths are found over them alone, in plain lists, with a pointer
+        # per node to the next arc worth trying, retreating from dead ends;
+        # the residual array is updated once at the end.
+        length = int(distance[sink])
+        usable = self.residual > 0
+        to_sink = _bfs(self.start, self.head, usable[self.reverse], [sink], source, limit=length)
+        tail_distance = distance[self.tail]
+        useful = np.flatnonzero(usable & (tail_distance >= 0) & (tail_distance < length) &
+                                (to_sink[self.head] == length - tail_distance - 1))
+        nodes_with, first, counts = np.unique(self.tail[useful], return_index=True, return_counts=True)
+        pointer = dict(zip(nodes_with.tolist(), first.tolist()))
+        end_of = dict(zip(nodes_with.tolist(), (first + counts).tolist()))
+        head = self.head[useful].tolist()
+        residual = self.residual[useful].tolist()
+        pushed = [0] * len(useful)
+
+        total = 0
+        path = []
+        nodes = [source]
+        v = source
+        while True:
+            if v == sink:
+                push = min(residual[k] for k in path)
+                for k in path:
+                    residual[k] -= push
+                    pushed[k] += push
+                total += push
+                # Back to the tail of the first saturated arc.
+                saturated = next(index for index, k in enumerate(path) if residual[k] == 0)
+                del path[saturated:]
+                del nodes[saturated + 1:]
+                v = nodes[-1]
+                continue
+
+            k, end = pointer.get(v, 0), end_of.get(v, 0)
+            while k < end and residual[k] == 0:
+                k += 1
+            pointer[v] = k
+            if k < end:
+                path.append(k)
+                v = head[k]
+                nodes.append(v)
+            elif v == source:
+                break
+            else:
+                nodes.pop()
+                path.pop()
+                v = nodes[-1]
+                pointer[v] += 1
+
+        # The reverse of a useful arc is never useful in the same phase.
+        self.residual[useful] = residual
+        self.residual[self.reverse[useful]] += pushed
+        return total
+
+
+def _bfs(start, head, usable, origins, target, distance=None, limit=None):
+    # Distances (-1 if unreachable) from the origins over the usable arcs,
+    # one frontier at a time with NumPy; stops once target is reached or
+    # at distance limit. A given distance array is extended in place.
+    if distance is None:
+        distance = np.full(len(start) - 1, -1, dtype=np.int64)
+        distance[origins] = 0
+    frontier = np.asarray(origins, dtype=start.dtype)
+    level = 0
+    while len(frontier) and distance[target] < 0 and (limit is None or level < limit):
+        level += 1
+        counts = start[frontier + 1] - start[frontier]
+        offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        arcs = np.repeat(start[frontier], counts) + offsets
+        reached = head[arcs[usable[arcs]]]
+        frontier = np.unique(reached[distance[reached] < 0])
+        distance[frontier] = level
+    return distance
+
+
+def max_flow(n, tails, heads, capacities, source, sink, backend='auto', cut=False):
+    """
+    Maximum flow from source to sink over the arcs tails[k] -> heads[k]
+    with capacities[k], on nodes 0..n-1. backend is 'dinic' (FlowNetwork),
+    'scipy' (scipy.sparse.csgraph.maximum_flow, compiled, but limited to
+    flows that fit in int32) or 'auto' (scipy when it is
+    installed and the flow fits, else dinic). Returns the flow value, or
+    (value, source_side) with cut=True, source_side being the boolean
+    array of the nodes on the source side of a minimum cut.
+    """
+    if backend == 'auto':
+        try:
+            return _scipy_max_flow(n, tails, heads, capacities, source, sink, cut)
+        except (ImportError, OverflowError):
+            backend = 'dinic'
+    if backend == 'dinic':
+        network = FlowNetwork(n, tails, heads, capacities)
+        value = network.max_flow(source, sink)
+        return (value, network.min_cut(source, sink)) if cut else value
+    if backend == 'scipy':
+        return _scipy_max_flow(n, tails, heads, capacities, source, sink, cut)
+    raise ValueError(f"Unknown max-flow backend: {backend!r}")
+
+
+def _scipy_max_flow(n, tails, heads, capacities, source, sink, cut):
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order, maximum_flow
+
+    capacities = np.asarray(capacities, dtype=np.int64)
+    # The flow is bounded by what leaves the source.
+    bound = capacities[np.asarray(tails) == source].sum()
+    if bound >= np.iinfo(np.int32).max:
+        raise OverflowError("Flow may not fit in int32; use the 'dinic' backend")
+    # Parallel arcs are merged (their capacities add up) in int64, then
+    # every arc is clipped to bound + 1: no arc can carry more than bound,
+    # so neither the flow nor the minimum cut changes, and it fits in int32.
+    graph = csr_matrix((capacities, (tails, heads)), shape=(n, n))
+    graph.sum_duplicates()
+    np.minimum(graph.data, bound + 1, out=graph.data)
+    graph = graph.astype(np.int32)
+    result = maximum_flow(graph, source, sink)
+    if not cut:
+        return int(result.flow_value)
+    # Residual capacities: what is left on each arc plus the flow that can
+    # be sent back on its reverse (the flow matrix is antisymmetric).
+    residual = (graph.astype(np.int64) - result.flow).tocsr()
+    residual.data[residual.data < 0] = 0
+    residual.eliminate_zeros()
+    source_side = np.zeros(n, dtype=bool)
+    source_side[breadth_first_order(residual, source, return_predecessors=False)] = True
+    return int(result.flow_value), source_side
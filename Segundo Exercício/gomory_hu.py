@@ -0,0 +1,276 @@
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from city_data import load_cities
+from flow_network import max_flow
+from graph_cache import cached_pairs
+
+JSON_FILE = 'Segundo Exercício/cities.json'
+DISTANCE_THRESHOLD = 3.5
+TOLERANCE = 1e-9
+# Pairs sent to a worker at a time in the direct mode
+PAIRS_PER_TASK = 64
+# Cuts sent to a worker at a time while building the tree
+CUTS_PER_TASK = 8
+
+
+class GomoryHuTree:
+    """
+    Gomory-Hu tree of an undirected network on nodes 0..n-1, where edge k
+    joins edge_i[k] and edge_j[k] with capacity capacities[k]: the maximum
+    flow between two nodes is the smallest weight on the tree path between
+    them. Built by Gusfield's algorithm (n - 1 maximum flows on the
+    network itself, no contraction) separately for each connected
+    component; nodes of different components have flow 0. With
+    workers > 1 the cuts of the next nodes are computed ahead in worker
+    processes (see _gusfield).
+    """
+
+    def __init__(self, n, edge_i, edge_j, capacities, backend='auto', workers=1):
+        edge_i = np.asarray(edge_i, dtype=np.int64)
+        edge_j = np.asarray(edge_j, dtype=np.int64)
+        capacities = np.asarray(capacities, dtype=np.int64)
+        self.parent = np.full(n, -1, dtype=np.int64)
+        self.weight = np.zeros(n, dtype=np.int64)
+
+        # Edges grouped by component, largest components first.
+        labels = _components(n, edge_i, edge_j)
+        members_of = np.argsort(labels, kind='stable')
+        sizes = np.bincount(labels, minlength=n)
+        node_ends = np.cumsum(sizes)
+        edge_order = np.argsort(labels[edge_i], kind='stable')
+        edge_counts = np.bincount(labels[edge_i], minlength=n)
+        edge_ends = np.cumsum(edge_counts)
+        local = np.empty(n, dtype=np.int64)
+        tasks = []
+        for label in np.argsort(-sizes, kind='stable'):
+            if sizes[label] < 2:
+                break
+            members = members_of[node_ends[label] - sizes[label]:node_ends[label]]
+            local[members] = np.arange(len(members))
+            edges = edge_order[edge_ends[label] - edge_counts[label]:edge_ends[label]]
+            tasks.append((members, (len(members), local[edge_i[edges]], local[edge_j[edges]],
+                                    capacities[edges], backend)))
+
+        if workers > 1 and tasks:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                trees = [_gusfield(*task, executor=executor, workers=workers) for _, task in tasks]
+        else:
+            trees = [_gusfield(*task) for _, task in tasks]
+        for (members, _), (parent, weight) in zip(tasks, trees):
+            has_parent = parent >= 0
+            self.parent[members[has_parent]] = members[parent[has_parent]]
+            self.weight[members] = weight
+
+        self.depth = _depths(self.parent)
+
+    def max_flow(self, u, v):
+        """Maximum flow between nodes u and v: the lightest edge between them."""
+        if u == v:
+            raise ValueError("Source and sink must be different nodes")
+        parent, weight, depth = self.parent, self.weight, self.depth
+        best = None
+        while u != v:
+            if depth[u] < depth[v]:
+                u, v = v, u
+            if parent[u] < 0:
+                return 0
+            best = weight[u] if best is None else min(best, weight[u])
+            u = parent[u]
+        return int(best)
+
+
+def _gusfield(n, edge_i, edge_j, capacities, backend, executor=None, workers=1):
+    # Gusfield's algorithm on a connected network with root 0: each node s
+    # is cut from its current parent t, the nodes on s's side that hung
+    # from t move under s, and s takes t's place if t's parent is on its
+    # side. Returns the parents (-1 for the root) and the edge weights.
+    # Any minimum s-t cut of the network will do, whenever it was found,
+    # so with an executor the cuts of the next nodes are computed ahead
+    # with their current parents; a cut is used if the parent of its node
+    # has not changed by then, and computed again otherwise.
+    network = (n, np.concatenate((edge_i, edge_j)), np.concatenate((edge_j, edge_i)),
+               np.concatenate((capacities, capacities)), backend)
+    parent = np.zeros(n, dtype=np.int64)
+    weight = np.zeros(n, dtype=np.int64)
+    ahead = {}
+    for s in range(1, n):
+        t = int(parent[s])
+        if executor is not None and ahead.get(s, (None,))[0] != t:
+            wanted = [(v, int(parent[v])) for v in range(s, min(s + workers * CUTS_PER_TASK, n))]
+            chunks = [wanted[k:k + CUTS_PER_TASK] for k in range(0, len(wanted), CUTS_PER_TASK)]
+            for chunk, cuts in zip(chunks, executor.map(_cuts, repeat(network), chunks)):
+                for (v, u), cut in zip(chunk, cuts):
+                    ahead[v] = (u, cut)
+        if s in ahead and ahead[s][0] == t:
+            value, side = ahead.pop(s)[1]
+        else:
+            value, side = _cuts(network, [(s, t)])[0]
+        weight[s] = value
+        moved = side & (parent == t)
+        moved[s] = False
+        parent[moved] = s
+        if side[parent[t]]:
+            parent[s] = parent[t]
+            parent[t] = s
+            weight[s] = weight[t]
+            weight[t] = value
+    parent[0] = -1
+    return parent, weight
+
+
+def _cuts(network, pairs):
+    n, tails, heads, capacities, backend = network
+    return [max_flow(n, tails, heads, capacities, s, t, backend=backend, cut=True)
+            for s, t in pairs]
+
+
+def _components(n, edge_i, edge_j):
+    # Component label (its smallest node) of every node, by propagating the
+    # smallest label along the edges with pointer jumping.
+    labels = np.arange(n)
+    while True:
+        lowest = np.minimum(labels[edge_i], labels[edge_j])
+        new = labels.copy()
+        np.minimum.at(new, edge_i, lowest)
+        np.minimum.at(new, edge_j, lowest)
+        new = new[new]
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def _depths(parent):
+    depth = np.full(len(parent), -1, dtype=np.int64)
+    parent = parent.tolist()
+    depth_list = depth.tolist()
+    for v in range(len(parent)):
+        path = []
+        while depth_list[v] < 0 and parent[v] >= 0:
+            path.append(v)
+            v = parent[v]
+        if depth_list[v] < 0:
+            depth_list[v] = 0
+        for w in reversed(path):
+            depth_list[w] = depth_list[parent[w]] + 1
+    return np.asarray(depth_list, dtype=np.int64)
+
+
+_direct_network = None
+
+
+def _start_direct_worker(network):
+    # Each worker keeps the directed network from the start, so a task
+    # only carries its pairs.
+    global _direct_network
+    _direct_network = network
+
+
+def _direct_flows(pairs):
+    n, tails, heads, capacities, backend = _direct_network
+    return [max_flow(n, tails, heads, capacities, s, t, backend=backend) for s, t in pairs]
+
+
+def direct_flows(n, tails, heads, capacities, pairs, backend='auto', workers=1):
+    """
+    Maximum flow of each (source, sink) pair on the directed network, one
+    maximum flow per pair, in chunks of PAIRS_PER_TASK over worker processes.
+    """
+    network = (n, tails, heads, capacities, backend)
+    chunks = [pairs[k:k + PAIRS_PER_TASK] for k in range(0, len(pairs), PAIRS_PER_TASK)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_start_direct_worker,
+                                 initargs=(network,)) as executor:
+            return [value for chunk in executor.map(_direct_flows, chunks) for value in chunk]
+    _start_direct_worker(network)
+    return [value for chunk in chunks for value in _direct_flows(chunk)]
+
+
+def read_pairs(path, index):
+    """(source, sink) city indices from a CSV with one "origem,destino" per line."""
+    pairs, names = [], []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('#'):
+                continue
+            if len(row) < 2:
+                print(f"Aviso: linha ignorada: {','.join(row)}")
+                continue
+            source, sink = row[0].strip(), row[1].strip()
+            unknown = [name for name in (source, sink) if name not in index]
+            if unknown:
+                print(f"Aviso: cidade(s) desconhecida(s), par ignorado: {', '.join(unknown)}")
+                continue
+            pairs.append((index[source], index[sink]))
+            names.append((source, sink))
+    return pairs, names
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fluxo máximo entre vários pares de cidades na mesma rede.")
+    parser.add_argument('pairs', help="CSV com um par 'origem,destino' por linha")
+    parser.add_argument('--json', default=JSON_FILE)
+    parser.add_argument('--threshold', type=float, default=DISTANCE_THRESHOLD)
+    parser.add_argument('--mode', choices=['direct', 'tree'], default='direct',
+                        help="'direct': a rede direcionada do Problema do Fluxo, um fluxo por par; "
+                             "'tree': árvore de Gomory-Hu de uma rede simetrizada, em que cada par "
+                             "de cidades próximas tem a soma das duas populações como capacidade "
+                             "nos dois sentidos (não é a rede do Problema do Fluxo)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--backend', choices=['auto', 'dinic', 'scipy'], default='auto')
+    parser.add_argument('--output', help="CSV de saída com origem, destino, fluxo e rede")
+    args = parser.parse_args()
+
+    started = time.time()
+    cities = load_cities(args.json)
+    pairs, names = read_pairs(args.pairs, cities.index())
+    if not pairs:
+        print("Nenhum par válido para calcular.")
+        return
+    for source, sink in names:
+        if source == sink:
+            print(f"Erro: origem e destino iguais ('{source}').")
+            return
+
+    pairs_i, pairs_j, _ = cached_pairs(cities, args.threshold + TOLERANCE)
+    populations = np.asarray(cities.populations)
+    if args.mode == 'tree':
+        capacities = populations[pairs_i] + populations[pairs_j]
+        keep = capacities > 0
+        tree = GomoryHuTree(len(cities), pairs_i[keep], pairs_j[keep], capacities[keep],
+                            backend=args.backend, workers=args.workers)
+        print(f"Árvore de Gomory-Hu construída em {time.time() - started:.2f}s")
+        print("Atenção: fluxos na rede simetrizada (capacidade = soma das duas populações nos "
+              "dois sentidos), não na rede direcionada do Problema do Fluxo.")
+        network = 'simetrizada'
+        values = [tree.max_flow(s, t) for s, t in pairs]
+    else:
+        tails = np.column_stack((pairs_i, pairs_j)).ravel()
+        heads = np.column_stack((pairs_j, pairs_i)).ravel()
+        capacities = populations[heads]
+        keep = capacities > 0
+        network = 'direcionada'
+        values = direct_flows(len(cities), tails[keep], heads[keep], capacities[keep], pairs,
+                              backend=args.backend, workers=args.workers)
+
+    for (source, sink), value in zip(names, values):
+        print(f"{source} -> {sink}: {value:,}")
+    print(f"Tempo total: {time.time() - started:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['origem', 'destino', 'fluxo', 'rede'])
+            for (source, sink), value in zip(names, values):
+                writer.writerow([source, sink, value, network])
+
+
+if __name__ == '__main__':
+    main()
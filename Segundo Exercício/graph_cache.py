@@ -0,0 +1,99 @@
+import glob
+import os
+
+import numpy as np
+
+from spatial_index import find_pairs
+
+# Bumped whenever the stored layout changes
+GRAPH_CACHE_VERSION = 1
+
+
+def cached_pairs(cities, radius, method='grid', use_cache=True):
+    """
+    Same (i, j, distance) arrays as find_pairs for the cities of
+    load_cities, kept on disk per (dataset hash, radius) in CSR form: row
+    pointers over i and, per row, the j and the distance of each pair. A
+    radius no larger than one already stored is answered by filtering
+    that graph's distances, with no geometry at all; a larger one is
+    computed, stored, and replaces the smaller graphs it contains.
+    """
+    if not use_cache or cities.source is None or cities.digest is None:
+        return find_pairs(cities.latitudes, cities.longitudes, radius, method)
+
+    n = len(cities)
+    stored = _stored_graphs(cities)
+    covering = [(stored_radius, path) for stored_radius, _, path in stored if stored_radius >= radius]
+    if covering:
+        stored_radius, path = min(covering)
+        try:
+            i, j, distances = _read_csr(path, n)
+        except (OSError, ValueError, KeyError):
+            pass  # Damaged file: computed again below.
+        else:
+            if stored_radius == radius:
+                return i, j, distances
+            keep = distances <= radius
+            return i[keep], j[keep], distances[keep]
+
+    i, j, distances = find_pairs(cities.latitudes, cities.longitudes, radius, method)
+    path = f"{_prefix(cities)}.{cities.digest}.{radius!r}.npz"
+    if _write_csr(path, n, i, j, distances):
+        for stored_radius, digest, old in _stored_graphs(cities, any_digest=True):
+            if old != path and (stored_radius <= radius or digest != cities.digest):
+                _remove(old)
+    return i, j, distances
+
+
+def _prefix(cities):
+    return f"{cities.source}.graph.v{GRAPH_CACHE_VERSION}"
+
+
+def _stored_graphs(cities, any_digest=False):
+    # (radius, digest, path) of the graphs stored for this dataset, read
+    # from the names "<json>.graph.v<version>.<digest>.<radius>.npz".
+    prefix = _prefix(cities)
+    digest = '*' if any_digest else cities.digest
+    graphs = []
+    for path in glob.glob(f"{glob.escape(prefix)}.{digest}.*.npz"):
+        stored_digest, _, radius_text = path[len(prefix) + 1:-len('.npz')].partition('.')
+        try:
+            graphs.append((float(radius_text), stored_digest, path))
+        except ValueError:
+            continue
+    return graphs
+
+
+def _read_csr(path, n):
+    with np.load(path) as stored:
+        indptr = stored['indptr']
+        indices = stored['indices']
+        distances = stored['distances']
+    if len(indptr) != n + 1 or indptr[-1] != len(indices):
+        raise ValueError(f"Graph cache {path} does not match the dataset")
+    i = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    return i, indices.astype(np.int64), distances
+
+
+def _write_csr(path, n, i, j, distances):
+    # Pairs arrive sorted by (i, j), so the row pointers are a cumulative
+    # count. Indices are stored as int32 when they fit.
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(i, minlength=n), out=indptr[1:])
+    index_type = np.int32 if n < 2 ** 31 else np.int64
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, 'wb') as f:
+            np.savez(f, indptr=indptr, indices=j.astype(index_type), distances=distances)
+        os.replace(temporary, path)
+    except OSError:
+        _remove(temporary)
+        return False
+    return True
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
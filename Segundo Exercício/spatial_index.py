@@ -0,0 +1,143 @@
+import numpy as np
+
+# Candidate pairs examined per block, which bounds the temporary arrays
+MAX_CANDIDATES_PER_BLOCK = 1 << 22
+# Bytes of temporaries allowed per tile of the dense distance matrix
+DENSE_MEMORY_BUDGET = 64 << 20
+# float64 temporaries alive at once while a tile is evaluated
+_DENSE_ARRAYS_PER_TILE = 3
+
+# Neighbouring cells visited from each cell (the other half is covered by
+# the symmetric visit from the neighbour).
+_FORWARD_CELLS = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def grid_pairs(latitudes, longitudes, radius):
+    """
+    Returns (i, j, distance) arrays with every pair of points i < j whose
+    Euclidean distance in raw latitude/longitude degrees is <= radius,
+    sorted by (i, j). Points are bucketed in a uniform grid of cells with
+    side `radius`, so each point is only compared with points in its own
+    and the neighbouring cells: the work is close to O(n + pairs).
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    n = len(latitudes)
+    if n < 2 or radius < 0:
+        return _empty_pairs()
+
+    # Slightly larger cells so rounding in the division can never put two
+    # points within the radius more than one cell apart.
+    cell = radius * (1 + 1e-9) if radius > 0 else 1.0
+    cell_x = np.floor(longitudes / cell).astype(np.int64)
+    cell_y = np.floor(latitudes / cell).astype(np.int64)
+    cell_x -= cell_x.min()
+    cell_y -= cell_y.min()
+    height = int(cell_y.max()) + 3
+    keys = cell_x * height + cell_y + 1
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+
+    pieces = []
+    for dx, dy in _FORWARD_CELLS:
+        target = keys + dx * height + dy
+        if dx == 0 and dy == 0:
+            # Same cell: only the points after this one in sorted order.
+            start = rank + 1
+        else:
+            start = np.searchsorted(sorted_keys, target, side='left')
+        end = np.searchsorted(sorted_keys, target, side='right')
+        counts = np.maximum(end - start, 0)
+        pieces.extend(_expand(latitudes, longitudes, radius, order, start, counts))
+
+    return _sorted_pairs(pieces)
+
+
+def dense_pairs(latitudes, longitudes, radius, memory_budget=DENSE_MEMORY_BUDGET):
+    """
+    Same result as grid_pairs, computed by brute force: the upper triangle
+    of the distance matrix is evaluated with NumPy broadcasting in square
+    tiles whose temporaries fit in memory_budget bytes, so memory stays
+    bounded however many points there are (apart from the pairs found).
+    Preferable to the grid when the radius covers most of the points.
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    n = len(latitudes)
+    if n < 2 or radius < 0:
+        return _empty_pairs()
+
+    tile = max(int((memory_budget / (8 * _DENSE_ARRAYS_PER_TILE)) ** 0.5), 1)
+    pieces = []
+    for row in range(0, n, tile):
+        row_end = min(row + tile, n)
+        tile_lat = latitudes[row:row_end, None]
+        tile_lon = longitudes[row:row_end, None]
+        for column in range(row, n, tile):
+            column_end = min(column + tile, n)
+            distances = (tile_lat - latitudes[None, column:column_end]) ** 2
+            distances += (tile_lon - longitudes[None, column:column_end]) ** 2
+            np.sqrt(distances, out=distances)
+            keep = distances <= radius
+            if column == row:
+                # Diagonal tile: only j > i.
+                keep &= np.arange(row_end - row)[:, None] < np.arange(column_end - column)[None, :]
+            rows, columns = np.nonzero(keep)
+            pieces.append((rows + row, columns + column, distances[rows, columns]))
+
+    return _sorted_pairs(pieces)
+
+
+def find_pairs(latitudes, longitudes, radius, method='grid'):
+    """
+    Pairs within radius by the chosen method: 'grid' (grid_pairs) or
+    'dense' (dense_pairs).
+    """
+    if method == 'grid':
+        return grid_pairs(latitudes, longitudes, radius)
+    if method == 'dense':
+        return dense_pairs(latitudes, longitudes, radius)
+    raise ValueError(f"Unknown pair method: {method!r}")
+
+
+def _expand(latitudes, longitudes, radius, order, start, counts):
+    # Materializes the candidate pairs (point, order[start + offset]) in
+    # blocks of about MAX_CANDIDATES_PER_BLOCK and keeps those within radius.
+    totals = np.cumsum(counts)
+    first = 0
+    n = len(counts)
+    while first < n:
+        base = totals[first - 1] if first else 0
+        last = int(np.searchsorted(totals, base + MAX_CANDIDATES_PER_BLOCK, side='right'))
+        last = max(last, first + 1)
+        block_counts = counts[first:last]
+        total = int(block_counts.sum())
+        if total:
+            sources = np.repeat(np.arange(first, last), block_counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(block_counts) - block_counts,
+                                                   block_counts)
+            targets = order[np.repeat(start[first:last], block_counts) + offsets]
+            distances = np.sqrt((latitudes[sources] - latitudes[targets]) ** 2 +
+                                (longitudes[sources] - longitudes[targets]) ** 2)
+            keep = distances <= radius
+            yield sources[keep], targets[keep], distances[keep]
+        first = last
+
+
+def _sorted_pairs(pieces):
+    if not pieces:
+        return _empty_pairs()
+    sources = np.concatenate([piece[0] for piece in pieces])
+    targets = np.concatenate([piece[1] for piece in pieces])
+    distances = np.concatenate([piece[2] for piece in pieces])
+    i = np.minimum(sources, targets)
+    j = np.maximum(sources, targets)
+    order = np.lexsort((j, i))
+    return i[order], j[order], distances[order]
+
+
+def _empty_pairs():
+    return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
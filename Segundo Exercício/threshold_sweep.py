@@ -0,0 +1,261 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from city_data import load_cities
+from flow_network import FlowNetwork
+from graph_cache import cached_pairs
+
+JSON_FILE = 'Segundo Exercício/cities.json'
+SOURCE_CITY_NAME = 'Miami'
+SINK_CITY_NAME = 'Seattle'
+TOLERANCE = 1e-9
+
+
+def sweep_pairs(cities, radii, method='grid'):
+    """
+    Pairs (i, j) within the largest radius, computed once and sorted by
+    distance, and for each radius how many of them it includes: the edges
+    of radius r are the first ends[r] pairs. The sweeps below accept the
+    radii in any order, repeated or not, and return one result per radius
+    given.
+    """
+    i, j, distances = cached_pairs(cities, max(radii) + TOLERANCE, method)
+    order = np.argsort(distances, kind='stable')
+    ends = np.searchsorted(distances[order], np.asarray(radii) + TOLERANCE, side='right')
+    return i[order], j[order], ends.tolist()
+
+
+def sweep_flow(cities, radii, source, sink, method='grid'):
+    """
+    Maximum flow from source to sink (city indices) for each radius, with
+    the arcs of the flow script: i -> j with the population of j and
+    j -> i with the population of i. All arcs are built once, inactive;
+    each radius activates the new ones and augments the previous flow.
+    """
+    radii, positions = _ascending(radii)
+    i, j, ends = sweep_pairs(cities, radii, method)
+    populations = np.asarray(cities.populations)
+    tails = np.column_stack((i, j)).ravel()
+    heads = np.column_stack((j, i)).ravel()
+    network = FlowNetwork(len(cities), tails, heads, populations[heads], active=False)
+
+    results = []
+    for radius, end in zip(radii, ends):
+        started = time.time()
+        network.activate(2 * end)
+        value = network.max_flow(source, sink)
+        results.append({'radius': radius, 'edges': end, 'value': value,
+                        'seconds': time.time() - started})
+    return _in_given_order(results, positions)
+
+
+def sweep_clique(cities, radii, method='grid'):
+    """
+    Maximum clique size for each radius. A clique larger than the previous
+    maximum must use one of the new edges, so only cliques containing a
+    node touched by them are searched, with the previous size as lower
+    bound: each touched node (fewest neighbours first) is searched with
+    the touched nodes already done removed from its neighbourhood.
+    Neighbourhoods are plain sets; bitsets (Python ints) are only built
+    among the candidates of one search, numbered locally.
+    """
+    radii, positions = _ascending(radii)
+    i, j, ends = sweep_pairs(cities, radii, method)
+    i, j = i.tolist(), j.tolist()
+    n = len(cities)
+    neighbours = [set() for _ in range(n)]
+    best = [0] if n else []
+
+    results = []
+    added = 0
+    for radius, end in zip(radii, ends):
+        started = time.time()
+        for k in range(added, end):
+            neighbours[i[k]].add(j[k])
+            neighbours[j[k]].add(i[k])
+        touched = set(i[added:end]) | set(j[added:end])
+        done = set()
+        for u in sorted(touched, key=lambda v: len(neighbours[v])):
+            done.add(u)
+            # A node in a clique of len(best) + 1 has len(best) neighbours.
+            if len(neighbours[u]) < len(best):
+                continue
+            candidates = {w for w in neighbours[u]
+                          if w not in done and len(neighbours[w]) >= len(best)}
+            # With u, each of the other len(best) nodes needs len(best) - 1
+            # neighbours among the candidates.
+            candidates = [w for w in candidates if len(neighbours[w] & candidates) >= len(best) - 1]
+            if len(candidates) < len(best):
+                continue
+            adjacency = _local_bitsets(neighbours, candidates)
+            found = _max_clique(adjacency, (1 << len(candidates)) - 1, len(best) - 1)
+            if found is not None:
+                best = [u] + [candidates[v] for v in found]
+        added = end
+        results.append({'radius': radius, 'edges': end, 'value': len(best),
+                        'clique': sorted(cities.names[v] for v in best),
+                        'seconds': time.time() - started})
+    return _in_given_order(results, positions)
+
+
+def sweep_cover(cities, radii, method='grid', time_limit=None):
+    """
+    Minimum number of schools covering every city for each radius (the
+    model of the cover script). Coverage only grows with the radius, so the
+    previous optimum is still feasible and is given to CBC as a warm start;
+    a radius that adds no pair keeps it without solving again.
+    """
+    import pulp
+
+    radii, positions = _ascending(radii)
+    i, j, ends = sweep_pairs(cities, radii, method)
+    i, j = i.tolist(), j.tolist()
+    n = len(cities)
+    neighbors = [[v] for v in range(n)]
+    x = [pulp.LpVariable(f"Construir_{v}", cat='Binary') for v in range(n)]
+    chosen = list(range(n))
+
+    results = []
+    added = 0
+    for radius, end in zip(radii, ends):
+        started = time.time()
+        for k in range(added, end):
+            neighbors[i[k]].append(j[k])
+            neighbors[j[k]].append(i[k])
+        # A single school cannot get any better.
+        if end > added and len(chosen) > 1:
+            prob = pulp.LpProblem("Cobertura_Escolas_Pais", pulp.LpMinimize)
+            prob += pulp.lpSum(x), "Numero_Total_Escolas"
+            for v in range(n):
+                prob += pulp.lpSum(x[w] for w in neighbors[v]) >= 1, f"Cobrir_{v}"
+            selected = set(chosen)
+            for v in range(n):
+                x[v].setInitialValue(1 if v in selected else 0)
+            prob.solve(pulp.PULP_CBC_CMD(msg=False, warmStart=True, timeLimit=time_limit))
+            if prob.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+                chosen = [v for v in range(n) if x[v].varValue is not None and x[v].varValue > 0.5]
+        added = end
+        results.append({'radius': radius, 'edges': end, 'value': len(chosen),
+                        'seconds': time.time() - started})
+    return _in_given_order(results, positions)
+
+
+def _ascending(radii):
+    # The sweeps only ever add edges, so they run over the distinct radii
+    # in ascending order; positions[k] is the result for radii[k].
+    unique, positions = np.unique(np.asarray(radii, dtype=np.float64), return_inverse=True)
+    return unique.tolist(), positions.tolist()
+
+
+def _in_given_order(results, positions):
+    return [dict(results[k]) for k in positions]
+
+
+def _local_bitsets(neighbours, candidates):
+    # Neighbourhoods of the candidates among themselves, as bitsets over
+    # their positions in candidates.
+    position = {v: k for k, v in enumerate(candidates)}
+    candidate_set = set(candidates)
+    adjacency = []
+    for v in candidates:
+        bits = 0
+        for w in neighbours[v] & candidate_set:
+            bits |= 1 << position[w]
+        adjacency.append(bits)
+    return adjacency
+
+
+def _max_clique(adjacency, candidates, lower):
+    # Largest clique inside the candidates bitset if it has more than
+    # lower nodes, else None. Branch and bound with a greedy colouring as
+    # the bound.
+    if not candidates:
+        return [] if lower < 0 else None
+    best = None
+    best_size = lower
+
+    def expand(clique, candidates):
+        nonlocal best, best_size
+        order, colours = _colour_sort(adjacency, candidates)
+        for position in range(len(order) - 1, -1, -1):
+            if len(clique) + colours[position] <= best_size:
+                return
+            v = order[position]
+            clique.append(v)
+            remaining = candidates & adjacency[v]
+            if remaining:
+                expand(clique, remaining)
+            elif len(clique) > best_size:
+                best, best_size = clique[:], len(clique)
+            clique.pop()
+            candidates &= ~(1 << v)
+
+    expand([], candidates)
+    return best
+
+
+def _colour_sort(adjacency, candidates):
+    # Greedy colouring: no two nodes of a colour class are adjacent, so a
+    # clique among the nodes up to a position has at most its colour nodes.
+    order, colours = [], []
+    uncoloured = candidates
+    colour = 0
+    while uncoloured:
+        colour += 1
+        available = uncoloured
+        while available:
+            lowest = available & -available
+            v = lowest.bit_length() - 1
+            available &= ~adjacency[v]
+            available &= ~lowest
+            uncoloured ^= lowest
+            order.append(v)
+            colours.append(colour)
+    return order, colours
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Varredura de DISTANCE_THRESHOLD para o fluxo máximo, a clique máxima ou a cobertura.")
+    parser.add_argument('problem', choices=['flow', 'clique', 'cover'])
+    parser.add_argument('--json', default=JSON_FILE)
+    parser.add_argument('--min', type=float, default=0.5, help="menor raio")
+    parser.add_argument('--max', type=float, default=5.0, help="maior raio")
+    parser.add_argument('--steps', type=int, default=50, help="quantidade de raios")
+    parser.add_argument('--source', default=SOURCE_CITY_NAME)
+    parser.add_argument('--sink', default=SINK_CITY_NAME)
+    parser.add_argument('--method', choices=['grid', 'dense'], default='grid')
+    parser.add_argument('--output', help="arquivo JSONL com um registro por raio")
+    args = parser.parse_args()
+
+    started = time.time()
+    cities = load_cities(args.json)
+    radii = np.linspace(args.min, args.max, args.steps).tolist()
+    if args.problem == 'flow':
+        index = cities.index()
+        for name in (args.source, args.sink):
+            if name not in index:
+                print(f"Erro: Cidade '{name}' não está entre as cidades válidas.")
+                return
+        results = sweep_flow(cities, radii, index[args.source], index[args.sink], args.method)
+    elif args.problem == 'clique':
+        results = sweep_clique(cities, radii, args.method)
+    else:
+        results = sweep_cover(cities, radii, args.method)
+
+    print(f"{'Raio':>8} {'Arestas':>9} {'Valor':>12} {'Tempo':>8}")
+    for result in results:
+        print(f"{result['radius']:8.3f} {result['edges']:9d} {result['value']:12,} {result['seconds']:7.2f}s")
+    print(f"Tempo total da varredura: {time.time() - started:.2f}s")
+
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps({'problem': args.problem, **result}, ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    main()